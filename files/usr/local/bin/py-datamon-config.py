@@ -3,13 +3,18 @@
 # ----------------------------------------------------------------------------
 # Utility to create a default configuration from csv-data.
 #
-# The program reads the first line of data from a file. It then creates a
-# default configuration for the data. If the first line contains
-# non-numeric data, this is considered as a header line and the values
-# are used for the data-labels.
+# The program samples the file: the first lines and (for regular files)
+# small blocks of lines at evenly spread offsets, so even huge files are
+# not read completely. From the samples, it infers the type of every
+# column, the x-column, the value-ranges and the sample-rate.
 #
-# Note: you really have to edit the result! If you e.g. don't remove
-# non-numeric columns from the configuration, the plot will fail.
+# The generated configuration contains one subplot for every numeric
+# column, non-numeric columns are skipped. All axes rescale by offsets
+# (for the y-axes derived from the sampled value-ranges), which keeps the
+# number of relayouts of live-plots small.
+#
+# If the first line contains non-numeric data, this is considered as a
+# header line and the values are used for the data-labels.
 #
 # Author: Bernhard Bablok
 # License: GPL3
@@ -18,18 +23,25 @@
 #
 # ----------------------------------------------------------------------------
 
-import locale, time, os, sys, json, csv
+import locale, time, os, sys, json, csv, datetime, statistics, math
 from   argparse import ArgumentParser
 
-# --- application imports   --------------------------------------------------
-
-libdir = os.path.join(os.path.dirname(sys.argv[0]),"..","lib","py-datamon")
-sys.path.append(str(libdir))
-
 # --- application class   ----------------------------------------------------
 
 class App:
 
+  # --- constants   ----------------------------------------------------------
+
+  HEAD_LINES      = 1000          # lines read from the start of the file
+  OFFSETS         = 32            # number of additional offsets
+  OFFSET_LINES    = 32            # lines read at every offset
+  LIVE_WINDOW     = 60            # seconds visible in time-based plots
+  DEFAULT_SAMPLES = 1000
+  MIN_SAMPLES     = 100
+  MAX_SAMPLES     = 5000
+  PADDING         = 0.25          # rescale-offset of y-axes (rel. to range)
+  EPOCH_RANGE     = (9.4e8,4.2e9) # numeric timestamps: years 2000-2100
+
   # --- constructor   --------------------------------------------------------
 
   def __init__(self):
@@ -47,7 +59,7 @@ class App:
     parser = ArgumentParser(add_help=False,description='Python Datamonitor')
 
     parser.add_argument('-c', '--config', metavar='conf',
-      help='name of config-file to create')
+      help='name of config-file to create (default: stdout)')
 
     parser.add_argument('-d', '--debug', action='store_true',
       dest='debug', default=False,
@@ -62,18 +74,6 @@ class App:
 
     return parser
 
-  # --- get delimiter of csv-data   ------------------------------------------
-
-  def _get_delim(self,file=None,line=None):
-    """ guess delimiter by sniffing the given line """
-
-    if file is None:
-      return csv.Sniffer().sniff(line).delimiter,line
-    else:
-      with open(file,'rt') as csvfile:
-        line = csvfile.readline().rstrip('\n')
-        return self._get_delim(line=line)
-
   # --- guess if words contain data or a header   ----------------------------
 
   def _check_header(self,words):
@@ -87,46 +87,229 @@ class App:
         pass                 # check next word
     return True              # no numeric field, so assume header
 
+  # --- sample lines of the file   -------------------------------------------
+
+  def _sample(self,f):
+    """ return list of chunks (lists of lines) sampled from the file """
+
+    head = []
+    for line in f:
+      head.append(line)
+      if len(head) == self.HEAD_LINES:
+        break
+    self._line_size = len(b"".join(head))/max(1,len(head))
+    self._size      = len(head)*self._line_size
+    chunks = [head]
+    if len(head) < self.HEAD_LINES or not f.seekable():
+      return chunks
+
+    # read small chunks at evenly spread offsets behind the first lines
+    # (skip partial lines)
+    head_size  = f.tell()
+    self._size = f.seek(0,os.SEEK_END)
+    for i in range(1,self.OFFSETS+1):
+      offset = int(i*self._size/(self.OFFSETS+1))
+      if offset <= head_size:
+        continue
+      f.seek(offset)
+      f.readline()
+      chunk = [f.readline() for _ in range(self.OFFSET_LINES)]
+      chunks.append([line for line in chunk if line.endswith(b"\n")])
+    return chunks
+
+  # --- convert field   ------------------------------------------------------
+
+  def _convert(self,word):
+    """ convert field to a tuple (type,value) """
+
+    try:
+      return ("number",float(word))
+    except ValueError:
+      pass
+    word = word.strip()
+    try:
+      ts = datetime.datetime.fromisoformat(word)
+    except ValueError:
+      return ("text",None)
+    if ts.tzinfo is None:
+      ts = ts.astimezone()                # local time
+    return ("date" if len(word) <= 10 else "datetime",ts.timestamp())
+
+  # --- infer column-types   -------------------------------------------------
+
+  def _infer_type(self,fields):
+    """ infer type of a column from the converted fields """
+
+    types  = [field[0] for field in fields]
+    counts = {t: types.count(t) for t in set(types)}
+    best   = max(counts,key=counts.get,default="text")
+    # allow a few invalid values
+    if counts.get(best,0) < 0.9*len(types):
+      return "text"
+    return best
+
+  # --- check if values are increasing   -------------------------------------
+
+  def _is_increasing(self,values):
+    """ check if the valid values are non-decreasing """
+
+    values = [v for v in values if v is not None and not math.isnan(v)]
+    return len(values) > 1 and all(a <= b for a,b in zip(values,values[1:]))
+
   # --- read data   ----------------------------------------------------------
 
   def read(self):
-    """ read data from csv/stdin """
+    """ sample data from csv/stdin """
 
     if self.input == "-":
-      self.input = "/dev/stdin"
+      f = sys.stdin.buffer
+    else:
+      f = open(self.input,"rb")
+    chunks = self._sample(f)
+    f.close()
 
-    delim,line = self._get_delim(file=self.input)
-    words      = line.split(delim)[1:]
+    # decode, skip comments and empty lines
+    chunks = [[line.decode(errors="replace").rstrip() for line in chunk]
+                                                          for chunk in chunks]
+    chunks = [[line for line in chunk if line and not line.startswith('#')]
+                                                          for chunk in chunks]
+    if not chunks[0]:
+      self.msg("App: no data in %s" % self.input,True)
+      sys.exit(3)
+    self.msg("App: sampled %d lines in %d chunks" %
+             (sum(map(len,chunks)),len(chunks)))
+
+    delim = csv.Sniffer().sniff(chunks[0][0]).delimiter
     self.msg("App: delimiter is '%s'" % delim)
+    chunks = [list(csv.reader(chunk,delimiter=delim)) for chunk in chunks]
 
+    words   = chunks[0][0]
     self._n = len(words)
     if self._check_header(words):
-      self._labels = words
+      self._labels = [word.strip() for word in words]
+      chunks[0]    = chunks[0][1:]
     else:
-      self._labels = ["column %d" % c for c in range(1,self._n+1)]
+      self._labels = ["column %d" % c for c in range(self._n)]
     self.msg("App: labels: %r" % (self._labels,))
+    self._lines = int(self._size/self._line_size)
+    self.msg("App: estimated number of lines: %d" % self._lines)
+
+    # convert complete rows, infer types and keep the values of every
+    # column (chunk by chunk, None for invalid values)
+    chunks = [[[self._convert(word) for word in row] for row in chunk
+                               if len(row) == self._n] for chunk in chunks]
+    self._types  = []
+    self._values = []
+    for col in range(self._n):
+      fields = [[row[col] for row in chunk] for chunk in chunks]
+      col_type = self._infer_type([f for chunk in fields for f in chunk])
+      self._types.append(col_type)
+      self._values.append([[value if t == col_type else None
+                                      for (t,value) in chunk]
+                                      for chunk in fields])
+    self.msg("App: column-types: %r" % (self._types,))
+    self._find_x()
+
+  # --- find x-column   ------------------------------------------------------
+
+  def _find_x(self):
+    """ find x-column: first increasing date/datetime or numeric column """
+
+    self._x = None
+    for types in [["date","datetime"],["number"]]:
+      for col,col_type in enumerate(self._types):
+        if (col_type in types and
+            self._is_increasing(sum(self._values[col],[]))):
+          self._x = col
+          break
+      if self._x is not None:
+        break
+    if self._x is None:
+      self._x = 0
+      self.msg("App: no increasing column, using column 0 as x",True)
+
+    # type of the x-value and sample-rate
+    self._x_type = self._types[self._x]
+    if self._x_type == "number":
+      values = [v for v in sum(self._values[self._x],[])
+                                        if v is not None and not math.isnan(v)]
+      if (values and self.EPOCH_RANGE[0] < values[0] and
+          values[-1] < self.EPOCH_RANGE[1]):
+        self._x_type = "datetime"
+      else:
+        self._x_type = "plain"
+
+    diffs = [b-a for chunk in self._values[self._x] for a,b in
+                           zip(chunk,chunk[1:]) if a is not None and
+                                                   b is not None and b > a]
+    self._dx = statistics.median(diffs) if diffs else None
+    self.msg("App: x-column: %d, type: %s, median distance: %r" %
+             (self._x,self._x_type,self._dx))
+
+  # --- round to a nice number   ---------------------------------------------
+
+  def _nice(self,value):
+    """ round value up to 1, 2 or 5 times a power of ten """
+
+    power = 10**math.floor(math.log10(value))
+    for f in [1,2,5,10]:
+      if f*power >= value:
+        return f*power
 
   # --- create config-file   -------------------------------------------------
 
   def create_config(self):
     """ create configuration """
 
-    # configure one plot for every value
+    # configure one plot for every numeric value
     plots = []
-    for i,label in enumerate(self._labels):
+    for col,label in enumerate(self._labels):
+      if col == self._x or self._types[col] != "number":
+        continue
       cfg = {
         "title": label,
-        "values": [{"col": i+1,"label": label}]
+        "values": [{"col": col,"label": label}]
         }
+
+      # rescale by an offset from the value-range (configured limits
+      # would be strict and turn rescaling off)
+      values = [v for v in sum(self._values[col],[])
+                                        if v is not None and math.isfinite(v)]
+      if values:
+        (lo,hi) = (min(values),max(values))
+        step    = "+%g" % self._nice(self.PADDING*(hi-lo) or
+                                     abs(hi)*self.PADDING or 1)
+        cfg["yaxis"] = {"rescale": {"min": step,"max": step}}
       plots.append(cfg)
 
+    # number of samples: a fixed time-window for time-based x-values
+    is_time = self._x_type in ["date","datetime"]
+    if is_time and self._dx:
+      samples = int(self.LIVE_WINDOW/self._dx)
+    else:
+      samples = self.DEFAULT_SAMPLES
+    samples = max(self.MIN_SAMPLES,min(samples,self.MAX_SAMPLES,self._lines))
+
+    # x-axis: rescale by a quarter of the visible window
+    x    = {"col": self._x}
+    axis = {"text": self._labels[self._x]}
+    if self._x_type != "plain":
+      x["type"] = self._x_type
+      if self._x_type == "datetime":
+        x["format"] = "%X"
+    if self._dx:
+      step = "+%g" % self._nice(samples*self._dx/4)
+      axis["rescale"] = {"min": step, "max": step}
+
     # create top-level config
     self._conf = {
-      "title":  "Autogenerated Configuration",
-      "cols":   min(int((self._n-1)/3)+1,3),
-      "x":      {"col": 0},
-      "legend": {"loc": None},
-      "plots":  plots
+      "title":   "Autogenerated Configuration",
+      "cols":    min(int((len(plots)-1)/3)+1,3),
+      "x":       x,
+      "xaxis":   axis,
+      "samples": samples,
+      "legend":  {"loc": None},
+      "plots":   plots
       }
 
   # --- save config-file   ---------------------------------------------------
@@ -134,6 +317,10 @@ class App:
   def save_config(self):
     """ save configuration """
 
+    if not self.config:
+      json.dump(self._conf,sys.stdout,indent=2)
+      print()
+      return
     f = open(self.config,"w")
     self.msg("App: Saving configuration to %s" % self.config,True)
     json.dump(self._conf,f,indent=2)
@@ -162,4 +349,3 @@ if __name__ == '__main__':
   app.read()
   app.create_config()
   app.save_config()
-
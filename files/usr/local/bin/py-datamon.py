@@ -10,6 +10,11 @@
 # stty -echo -F /dev/ttyUSB0 115200
 # py-datamon.py -c myconf.json /dev/ttyUSB0
 #
+# For data without timestamps, option -T adds a timestamp-column within
+# the reader-thread (replaces a pipe from py-datareader.py).
+#
+# Growing csv-files (e.g. logs) are plotted live with option -F.
+#
 # Author: Bernhard Bablok
 # License: GPL3
 #
@@ -21,12 +26,16 @@ import locale, time, os, sys, json, traceback, signal, threading, select
 from   argparse import ArgumentParser
 from   pathlib  import Path
 
+START_TIME = time.perf_counter()
+
 # --- application imports   --------------------------------------------------
 
 libdir = Path(sys.argv[0]).parent / "../lib/py-datamon"
 sys.path.append(str(libdir))
 
-from lib import DMData, DMPlot, DMConfigPlot
+# note: DMData and DMPlot (numpy, pandas, matplotlib) are imported lazily
+import lib
+from lib import DMConfigPlot, DMConfigError, DMStats, DMProfile
 
 # --- application class   ----------------------------------------------------
 
@@ -35,6 +44,8 @@ class App:
   # --- constants   ----------------------------------------------------------
 
   WAIT_INTERVAL = 1     # interval to check for stop-event
+  CHECK_LINES   = 100   # number of lines checked with --check-config
+  WATCH_INTERVAL = 1    # interval to check for changed config-files
 
   # --- constructor   --------------------------------------------------------
 
@@ -43,6 +54,9 @@ class App:
 
     self.debug       = False
     self.config      = None
+    self.configs     = []
+    self.stats       = None
+    self.profiler    = None
     self._threads    = []
     self._stop_event = threading.Event()
     parser = self._get_parser()
@@ -61,7 +75,39 @@ class App:
       default=100, help='update frequency in milliseconds (default: 100)')
 
     parser.add_argument('-c', '--config', metavar='conf',
-      help='config-file')
+      dest='conf_files', action='append',
+      help='config-file (repeat for multiple figures sharing the data)')
+
+    parser.add_argument('-T', '--timestamp', metavar='columns', type=int,
+      default=0, help='check columns and add timestamps (like py-datareader)')
+
+    parser.add_argument('-R', '--replay', metavar='speed', type=float,
+      help='replay csv-file as live-data with the given speed (1: real-time '
+           'of the x-values, 0: as fast as possible)')
+    parser.add_argument('--replay-rate', metavar='rate', type=float,
+      dest='replay_rate', help='replay csv-file with rate records/s')
+
+    parser.add_argument('-F', '--follow', action='store_true',
+      dest='follow', default=False,
+      help='plot the end of a growing csv-file and follow new lines')
+
+    parser.add_argument('-W', '--watch', action='store_true',
+      dest='watch', default=False,
+      help='reload changed config-files (live-plots only)')
+    parser.add_argument('--check-config', action='store_true',
+      dest='check', default=False,
+      help='check configuration with the first lines of the input and exit')
+
+    parser.add_argument('-S', '--stats', action='store_true',
+      dest='show_stats', default=False,
+      help='show runtime-statistics as overlay (live-plots only)')
+    parser.add_argument('-M', '--metrics', metavar='target',
+      help='export runtime-statistics to a file or to [host:]port')
+    parser.add_argument('-P', '--profile', metavar='prof_file',
+      help='profile reader and animation, write pstats or folded stacks')
+    parser.add_argument('--profile-frames', metavar='frames', type=int,
+      dest='profile_frames', default=100,
+      help='number of frames to profile (default: 100)')
 
     parser.add_argument('-d', '--debug', action='store_true',
       dest='debug', default=False,
@@ -81,14 +127,31 @@ class App:
   def _read(self):
     """ read data from csv (synchronously) or from pipe/device (async) """
 
-    if self.input != "-" and Path(self.input).is_file():
+    if self.replay is not None or self.replay_rate:
+      # replay the csv-data like live-data
+      for config in self.configs:
+        config.is_live = True
+      reader_thread = self._data.start_replay(self.input,self._stop_event,
+                                              speed=self.replay or 0,
+                                              rate=self.replay_rate or 0)
+      self._threads.append(reader_thread)
+    elif self.follow and Path(self.input).is_file():
+      # load the end of the csv-data, then follow it like live-data
+      for config in self.configs:
+        config.is_live = True
+      reader_thread = self._data.start_follow(self.input,self._stop_event)
+      self._threads.append(reader_thread)
+    elif self.input != "-" and Path(self.input).is_file():
       # just import the csv-data directly
       self._data.import_file(self.input)
-      self.config.is_live = False
+      for config in self.configs:
+        config.is_live = False
     else:
       # use a reader-thread if we are reading from a pipe or device
-      self.config.is_live = True
-      reader_thread = self._data.start_reader(self.input,self._stop_event)
+      for config in self.configs:
+        config.is_live = True
+      reader_thread = self._data.start_reader(self.input,self._stop_event,
+                                              self.timestamp)
       self._threads.append(reader_thread)
 
   # --- print message   ------------------------------------------------------
@@ -105,38 +168,115 @@ class App:
   # --- read configuration   --------------------------------------------------
 
   def read_config(self):
-    """ read configuration-file, if supplied """
-
-    conf_file = None
-    if self.config:
-      conf_file = Path(self.config)
-      if not conf_file.exists() and not conf_file.is_absolute():
-        # try in default location
-        p = Path(sys.argv[0]).parent / "../lib/py-datamon/configs" / self.config
-        if not conf_file.exists():
-          self.msg("App: config-file %s does not exist" % self.config,True)
-          return False
+    """ read configuration-files, if supplied """
+
+    conf_files = []
+    if self.conf_files:
+      for name in self.conf_files:
+        conf_file = Path(name)
+        if not conf_file.exists() and not conf_file.is_absolute():
+          # try in default location
+          conf_file = (
+            Path(sys.argv[0]).parent / "../lib/py-datamon/configs" / name)
+          if not conf_file.exists():
+            self.msg("App: config-file %s does not exist" % name,True)
+            return False
+        conf_files.append(conf_file)
     elif self.input != "-" and Path(self.input).is_file():
-      conf_file = Path(self.input).with_suffix(".json")
-
-    if not conf_file:
+      conf_files.append(Path(self.input).with_suffix(".json"))
+    else:
       # use default
-      conf_file = (
+      conf_files.append(
         Path(sys.argv[0]).parent / "../lib/py-datamon/configs/default.json"
       )
 
-    try:
-      self.msg(f"App: reading configuration from {conf_file}")
-      f = open(conf_file,"r")
+    self._conf_files = conf_files
+    for conf_file in conf_files:
+      try:
+        self.configs.append(self._load_config(conf_file))
+      except DMConfigError as ex:
+        self.msg(f"App: invalid configuration {conf_file}: {ex}",True)
+        return False
+      except:
+        self.msg(f"App: reading configuration from {conf_file} failed",True)
+        if self.debug:
+          traceback.print_exc()
+        return False
+
+    # the first configuration defines the shared data
+    self.config = self.configs[0]
+    for conf_file,config in zip(conf_files[1:],self.configs[1:]):
+      try:
+        self.config.merge(config)
+      except ValueError as ex:
+        self.msg(f"App: configuration {conf_file} does not match: {ex}",True)
+        return False
+    return True
+
+  # --- load a configuration-file   -----------------------------------------
+
+  def _load_config(self,conf_file):
+    """ load and parse a configuration-file """
+
+    self.msg(f"App: reading configuration from {conf_file}")
+    with open(conf_file,"r") as f:
       plot = json.load(f)
-      f.close()
-      self.config = DMConfigPlot(self,plot)
-      return True
-    except:
-      self.msg(f"App: reading configuration from {conf_file} failed",True)
+    return DMConfigPlot(self,plot)
+
+  # --- reload changed configuration-files   ---------------------------------
+
+  def _watch_configs(self,plotters):
+    """ reload changed configuration-files (called from the timer) """
+
+    now = time.monotonic()
+    if now < self._next_watch:
+      return
+    self._next_watch = now + self.WATCH_INTERVAL
+
+    for n,(conf_file,plotter) in enumerate(zip(self._conf_files,plotters)):
+      try:
+        mtime = conf_file.stat().st_mtime
+      except OSError:
+        continue                   # e.g. editor replaces the file
+      if mtime == self._mtimes[n]:
+        continue
+      self._mtimes[n] = mtime
+      self.msg(f"App: reloading configuration {conf_file}",True)
+      try:
+        config = self._load_config(conf_file)
+        config.is_live = True
+        self.config.rebind(config)
+        self._data.check_columns(config)
+        plotter.reload(config)
+      except Exception as ex:
+        # e.g. invalid json or values which fail when plotting
+        self.msg(f"App: configuration {conf_file} not reloaded: {ex}",True)
+
+  # --- check configuration   -----------------------------------------------
+
+  def check_config(self):
+    """ check configuration against the first lines of the input """
+
+    if self.input == "-":
+      f = sys.stdin
+    else:
+      f = open(self.input,"r")
+    lines = []
+    for line in f:
+      lines.append(line)
+      if len(lines) == self.CHECK_LINES:
+        break
+    f.close()
+
+    try:
+      n = lib.DMData(self).check_sample(lines,self.timestamp)
+    except Exception as ex:
+      self.msg("App: configuration does not match the data: %s" % ex,True)
       if self.debug:
         traceback.print_exc()
       return False
+    self.msg("App: configuration is valid (checked %d records)" % n,True)
+    return True
 
   # --- setup signal handler   ------------------------------------------------
 
@@ -152,20 +292,61 @@ class App:
     """ cleanup ressources """
 
     self._stop_event.set()
+    if self.profiler:
+      self.profiler.finish()
 
     map(threading.Thread.join,self._threads)
     self.msg("App: ... finished")
 
+  # --- report startup time   -----------------------------------------------
+
+  def _report_startup(self):
+    """ print import- and startup-times (debug only) """
+
+    if not self.debug:
+      return
+    width = max(map(len,lib.import_times),default=0)
+    for name,secs in sorted(lib.import_times.items(),key=lambda t: t[1]):
+      self.msg("App: startup: import %-*s %8.1f ms" % (width,name,1000*secs))
+    self.msg("App: startup: %-*s %8.1f ms" %
+             (width+7,"total",1000*(time.perf_counter()-START_TIME)))
+
   # --- run application   ----------------------------------------------------
 
   def run(self):
     """ run application """
 
-    self._data = DMData(self)
-    self._read()
+    if self.show_stats or self.metrics:
+      self.stats = DMStats(self)
+      if self.metrics:
+        self._threads.append(
+          self.stats.start_export(self.metrics,self._stop_event))
+
+    if self.profile:
+      self.profiler = DMProfile(self)
+      self.profiler.start()
+
+    try:
+      self._data = lib.DMData(self)
+      self._read()
+    except ValueError as ex:
+      # invalid expressions of derived values
+      self.msg("App: %s" % ex,True)
+      return
     self.msg("App: running ...")
-    plotter = DMPlot(self,self.config,data=self._data)
-    plotter.plot()
+    plotters = [lib.DMPlot(self,config,data=self._data,index=i)
+                                       for i,config in enumerate(self.configs)]
+
+    # all figures share the data and a single timer
+    event_source = None
+    for plotter in plotters:
+      event_source = plotter.create(event_source)
+    if self.watch and event_source:
+      self._mtimes     = [f.stat().st_mtime for f in self._conf_files]
+      self._next_watch = 0
+      event_source.add_callback(self._watch_configs,plotters)
+    self._report_startup()
+    plotters[0].show()
     self.msg("App: plotting finished ...")
 
 # --- main program   ---------------------------------------------------------
@@ -179,6 +360,8 @@ if __name__ == '__main__':
   app = App()
   if not app.read_config():
     sys.exit(3)
+  if app.check:
+    sys.exit(0 if app.check_config() else 3)
 
   # setup signal handlers
   signal.signal(signal.SIGTERM,app.signal_handler)
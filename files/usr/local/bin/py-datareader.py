@@ -4,8 +4,12 @@
 # Read data from file (e.g. device) and add timestamp
 #
 # MCUs without RTC will usually only output a timestamp since boot. This
-# program adds an additional column with a true (unix) timestamp. It uses
-# the ts of the first line as an offset to have consistent time-data.
+# program adds an additional column with a true (unix) timestamp. The
+# timestamps are taken from a monotonic clock anchored once to wall-time,
+# so they are consistent and cheap.
+#
+# Output is written in batches: lines are flushed after every read from
+# the input, or with option -l after at most the given latency.
 #
 # Author: Bernhard Bablok
 # License: GPL3
@@ -14,14 +18,23 @@
 #
 # ----------------------------------------------------------------------------
 
-import locale, time, os, sys, csv, threading, signal, select, datetime
+import locale, time, os, sys, csv, threading, signal, select
 from   argparse import ArgumentParser
+from   pathlib  import Path
+
+# --- application imports   --------------------------------------------------
+
+libdir = Path(sys.argv[0]).parent / "../lib/py-datamon"
+sys.path.append(str(libdir))
+
+from lib import DMTimestamper
 
 # --- application class   ----------------------------------------------------
 
 class App(object):
 
   WAIT_INTERVAL = 1     # interval to check for stop-event
+  READ_SIZE     = 65536 # maximal number of bytes per read
 
   # --- constructor   --------------------------------------------------------
 
@@ -33,6 +46,7 @@ class App(object):
     self._linenr     = 0
     parser = self._get_parser()
     parser.parse_args(namespace=self)
+    self._stamper    = DMTimestamper(self.ts_format)
 
     # check values
     if not self.columns:
@@ -53,6 +67,9 @@ class App(object):
     parser.add_argument('-f', '--ts-format', metavar='ts-format',
       dest='ts_format', default='i', nargs='?',
       help="timestamp-format (i=iso, u=unix, or generic format, default: i)")
+    parser.add_argument('-l', '--latency', metavar='latency',
+      type=float, default=0,
+      help="buffer output for at most latency ms (default: 0, flush per read)")
 
     parser.add_argument('-d', '--debug', action='store_true',
       dest='debug', default=False,
@@ -113,69 +130,78 @@ class App(object):
 
     if self.input == "-":
       self.msg("App: reading data from stdin")
-      read_list = [sys.stdin]
+      fd = sys.stdin.fileno()
     else:
       self.msg("App: reading data from %s" % self.input)
-      read_list = [open(self.input,buffering=1)]
-
-    eof = False
-    while read_list:
-      fd_ready = select.select(read_list,[],[],self.WAIT_INTERVAL)[0]
+      fd = os.open(self.input,os.O_RDONLY)
+
+    latency = self.latency/1000
+    rest    = b""
+    output  = []
+    first   = 0                       # time of the oldest buffered line
+    while True:
+      timeout = self.WAIT_INTERVAL
+      if output:
+        timeout = max(0,first+latency-time.monotonic())
+      fd_ready = select.select([fd],[],[],timeout)[0]
       if self._stop_event.is_set():
         self.msg("App: request to stop reading")
         break
       if fd_ready:
-        line = fd_ready[0].readline().rstrip('\n')
-        #self.msg("App: line: %s" % line)
-        if not line:
-          # quit after two consecutive empty lines
-          if eof:
-            read_list.clear()
-          else:
-            eof = True
-            continue
+        chunk = os.read(fd,self.READ_SIZE)
+        if not chunk:
+          # EOF (blank lines are just skipped)
+          lines = [rest]
+          rest  = b""
         else:
-          eof = False
-          self._handle_line(line.rstrip())
+          lines = (rest+chunk).split(b"\n")
+          rest  = lines.pop()
+        if not output:
+          first = time.monotonic()
+        for line in lines:
+          line = self._handle_line(line.decode(errors="replace").rstrip())
+          if line:
+            output.append(line)
+        if not chunk:
+          break
+
+      # flush output if the latency is exceeded
+      if output and time.monotonic()-first >= latency:
+        self._write(output)
+        output = []
+    self._write(output)
+
+  # --- write lines   ---------------------------------------------------------
+
+  def _write(self,lines):
+    """ write lines to stdout and flush """
+
+    if lines:
+      sys.stdout.write("\n".join(lines)+"\n")
+      sys.stdout.flush()
 
   # --- handle single line   -------------------------------------------------
 
   def _handle_line(self,line):
-    """ process a single line """
+    """ process a single line, return line with timestamp or None """
 
+    if not line:
+      return None
     self._linenr += 1
     if self._first:
       self.sep   = csv.Sniffer().sniff(line).delimiter # check for delimiter
       self.msg("App: delimiter is: %s" % self.sep)
-      words = line.split(self.sep)
-      if len(words) != self.columns or not words[0]:
-        self.msg("App: ignoring incomplete line (%d): %s" %
-                 (self._linenr,line),force=True)
-        return
-      else:
-        self._first = False
-        self._linenr -= 1
-        self._handle_line(line)
-        return
-
-    # split line and check if line is complete
-    words = line.split(self.sep)
-    if len(words) != self.columns or not words[0]:
+
+    # check if line is complete and add timestamp
+    stamped = self._stamper.stamp(line,self.sep,self.columns)
+    if not stamped:
       self.msg("App: ignoring incomplete line (%d): %s" %
                (self._linenr,line),force=True)
-      return
-
-    # calculate timestamp and add column
-    if self.ts_format == 'i':
-      ts = '"{}"'.format(datetime.datetime.now().isoformat())
-    elif self.ts_format == 'u':
-      ts = str(datetime.datetime.now().timestamp())
     else:
-      ts = '"{}"'.format(datetime.datetime.now().strftime(self.ts_format))
+      self._first = False
+    return stamped
+
 
-    print("%s%s%s" % (line,self.sep,ts),flush=True)
-      
-      
 # --- main program   ---------------------------------------------------------
 
 if __name__ == '__main__':
@@ -10,38 +10,65 @@
 # ----------------------------------------------------------------------------
 
 import types
+from lib import DMConfigBase
 
 # --- configuration-object for y-values   ------------------------------------
 
-class DMConfigAxis(types.SimpleNamespace):
-  def __init__(self,app,conf):
+class DMConfigAxis(DMConfigBase):
 
-    self.msg = app.msg
+  KEYS = ("text","min","max","rescale","color","options")
+
+  __slots__ = KEYS + ("text_opts",)
+
+  def __init__(self,app,conf,path="axis"):
+
+    super(DMConfigAxis,self).__init__(app,path)
 
     # set defaults
     self.text      = ""
     self.min       = None
     self.max       = None
     self.rescale   = {"max": "*2.0", "min": "*2.0"}
+    self.color     = None
     self.text_opts = {}
     self.options   = {}
 
     # override with data from config-file
     if isinstance(conf,dict):
-      super(DMConfigAxis,self).__init__(**conf)
+      self._update(conf)
     else:
-      super(DMConfigAxis,self).__init__(text=conf)
+      self.text = conf
 
     if isinstance(self.text,dict):
-      self.text_opts = self.text
-      self.text      = self.text_opts['text']
-      del self.text_opts['text']
+      self.text_opts = dict(self.text)
+      self.text      = self.text_opts.pop('text',"")
+    self._check_type("text",(str,))
+    self._check_type("min",(int,float,str),optional=True)
+    self._check_type("max",(int,float,str),optional=True)
+    self._check_type("options",(dict,))
 
     if isinstance(self.rescale,str):
       self.rescale = {"max": self.rescale, "min": self.rescale}
-    self.rescale = types.SimpleNamespace(**self.rescale)
+    self._check_type("rescale",(dict,))
+    self.rescale = types.SimpleNamespace(
+      min=self._parse_rescale(self.rescale.get("min","*2.0")),
+      max=self._parse_rescale(self.rescale.get("max","*2.0")))
 
     # convert special attributes to options
-    if hasattr(self,"color") and not 'color' in self.text_opts:
+    if self.color and not 'color' in self.text_opts:
       self.text_opts['color'] = self.color
-      del self.color
+
+  # --- parse rescale-definition   -------------------------------------------
+
+  def _parse_rescale(self,value):
+    """ parse rescale-value into a tuple (mode,number) """
+
+    if value in ["off","auto"]:
+      return (value,None)
+    try:
+      if value[0] in "*+":
+        return (value[0],float(value[1:]))
+    except (TypeError,IndexError,ValueError):
+      pass
+    self._error("unsupported value %r (valid: off, auto, *factor, +offset)" %
+                (value,),"rescale")
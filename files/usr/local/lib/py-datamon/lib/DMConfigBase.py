@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMConfigBase: base class of all configuration objects
+#
+# Configuration objects have a fixed set of attributes (__slots__), so
+# attribute access in the animation-loop is cheap and typos in the
+# configuration-file are detected. All values are validated when the
+# configuration is loaded, errors raise a DMConfigError with the path of
+# the invalid attribute (e.g. "plots[1].values[0].axis").
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+from lib import DMConfigError
+
+# --- base class of configuration-objects   ----------------------------------
+
+class DMConfigBase:
+  """ configuration-object with fixed attributes and validation """
+
+  __slots__ = ("msg","_path")
+
+  KEYS = ()          # attributes valid within the configuration-file
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,app,path):
+    """ constructor """
+
+    self.msg   = app.msg
+    self._path = path
+
+  # --- string representation   ----------------------------------------------
+
+  def __repr__(self):
+    """ return string representation (for debugging) """
+
+    items = ["%s=%r" % item for item in self.asdict().items()]
+    return "%s(%s)" % (type(self).__name__,", ".join(items))
+
+  # --- compare configurations   ---------------------------------------------
+
+  def __eq__(self,other):
+    """ compare all attributes (except the message-function) """
+
+    return type(other) is type(self) and self._attrs() == other._attrs()
+
+  # --- values of all attributes   -------------------------------------------
+
+  def _attrs(self):
+    """ return values of all attributes (except the message-function) """
+
+    return [getattr(self,name,None) for cls in type(self).__mro__
+                                for name in getattr(cls,"__slots__",())
+                                if name not in DMConfigBase.__slots__]
+
+  # --- attributes as dict   -------------------------------------------------
+
+  def asdict(self):
+    """ return attributes of the configuration-file as dict """
+
+    return {key: getattr(self,key) for key in self.KEYS}
+
+  # --- override defaults with data from config-file   -----------------------
+
+  def _update(self,conf):
+    """ set attributes from the configuration-file """
+
+    if not isinstance(conf,dict):
+      self._error("expected a dictionary, got %r" % (conf,))
+    for key,value in conf.items():
+      if key not in self.KEYS:
+        self._error("unknown attribute %r (valid: %s)" %
+                    (key,", ".join(self.KEYS)))
+      setattr(self,key,value)
+
+  # --- raise error   --------------------------------------------------------
+
+  def _error(self,text,key=None):
+    """ raise DMConfigError for the object or one of its attributes """
+
+    path = ".".join(p for p in (self._path,key) if p) or "configuration"
+    raise DMConfigError("%s: %s" % (path,text))
+
+  # --- check type of attribute   --------------------------------------------
+
+  def _check_type(self,key,types,optional=False):
+    """ check type of an attribute, booleans are only valid as bool """
+
+    value = getattr(self,key)
+    if value is None and optional:
+      return
+    if (not isinstance(value,types) or
+        isinstance(value,bool) and bool not in types):
+      self._error("expected %s, got %r" %
+                  (" or ".join(t.__name__ for t in types),value),key)
+
+  # --- check value of attribute   -------------------------------------------
+
+  def _check_choice(self,key,choices):
+    """ check that the attribute is one of the choices """
+
+    value = getattr(self,key)
+    if value not in choices:
+      self._error("unsupported value %r (valid: %s)" %
+                  (value,", ".join(map(str,choices))),key)
+
+  # --- check minimal value of attribute   -----------------------------------
+
+  def _check_min(self,key,minimum):
+    """ check that the (integer) attribute is at least minimum """
+
+    self._check_type(key,(int,))
+    if getattr(self,key) < minimum:
+      self._error("must be at least %d, got %r" %
+                  (minimum,getattr(self,key)),key)
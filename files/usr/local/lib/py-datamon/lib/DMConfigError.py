@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMConfigError: error in the configuration
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+# --- configuration error   --------------------------------------------------
+
+class DMConfigError(ValueError):
+  """ invalid configuration (the message contains the path of the error) """
+  pass
@@ -9,20 +9,33 @@
 #
 # ----------------------------------------------------------------------------
 
-import types, math
-from lib import DMConfigSubplot, DMConfigValue, DMConfigAxis, DMConfigX
+import math
+from lib import DMConfigBase, DMConfigSubplot, DMConfigAxis, DMConfigX
+from lib import DMConfigTrigger, DMConfigError
 
 # --- configuration-object for plots   ---------------------------------------
 
-class DMConfigPlot(types.SimpleNamespace):
+class DMConfigPlot(DMConfigBase):
+
+  KEYS = ("width","height","title","options","legend","rows","cols","x",
+          "samples","xaxis","yaxis","yaxis2","grid","render","trigger","plots")
+
+  # names of the renderers (see DMPlot)
+  RENDERERS = ("lines","collection","raster")
+
+  # attributes of the x-definition which must match for shared data
+  DATA_KEYS_X = ("col","scale","normalize","gap")
+
+  __slots__ = KEYS + ("title_opts","grid_opts","col_scaled","col_scales",
+                      "derived","is_live")
 
   # --- constructor   --------------------------------------------------------
 
   def __init__(self,app,conf):
     """ constructor """
 
-    self.msg = app.msg
-    
+    super(DMConfigPlot,self).__init__(app,"")
+
     # set defaults
     self.width      = None
     self.height     = None
@@ -30,6 +43,7 @@ class DMConfigPlot(types.SimpleNamespace):
     self.title_opts = {}
     self.options    = {"constrained_layout": True}
     self.legend     = {"loc": "best"}
+    self.rows       = None
     self.cols       = 1
     self.x          = {}
     self.samples    = None
@@ -38,26 +52,61 @@ class DMConfigPlot(types.SimpleNamespace):
     self.yaxis2     = None
     self.grid       = True
     self.grid_opts  = {"which": "both","axis": "both"}
+    self.render     = "lines"
+    self.trigger    = None
+    self.plots      = None
+    self.is_live    = False
 
     # override with data from config-file
-    super(DMConfigPlot,self).__init__(**conf)
+    self._update(conf)
+
+    self._check_type("width",(int,),optional=True)
+    self._check_type("height",(int,),optional=True)
+    self._check_type("rows",(int,),optional=True)
+    self._check_min("cols",1)
+    self._check_type("options",(dict,))
+    self._check_type("legend",(dict,))
+    self._check_choice("render",self.RENDERERS)
+    self._parse_samples()
 
     # set axis
     self.x     = DMConfigX(app,self.x)
-    self.xaxis = DMConfigAxis(app,self.xaxis)
-    self.yaxis = DMConfigAxis(app,self.yaxis)
+    self.xaxis = DMConfigAxis(app,self.xaxis,"xaxis")
+    self.yaxis = DMConfigAxis(app,self.yaxis,"yaxis")
     if self.yaxis2:
-      self.yaxis2 = DMConfigAxis(app,self.yaxis2)
+      self.yaxis2 = DMConfigAxis(app,self.yaxis2,"yaxis2")
+    if self.trigger:
+      self.trigger = DMConfigTrigger(app,self.trigger)
 
     # parse configuration for subplots
+    if not isinstance(self.plots,list) or not self.plots:
+      self._error("needs a list of subplots","plots")
     self.msg("DMConfigPlot: parsing config for %d subplots" % len(self.plots))
-    self.plots = [DMConfigSubplot(app,self,plot) for plot in self.plots]
+    self.plots = [DMConfigSubplot(app,self,plot,"plots[%d]" % i)
+                                            for i,plot in enumerate(self.plots)]
 
     # collect y-columns with scaling from subplots
     self.col_scaled = {}
     for plots in self.plots:
         self.col_scaled.update(plots.col_scaled)
 
+    # scale of every column of the values (1: unscaled): the data is only
+    # scaled once, so a column can't be plotted with different scales
+    self.col_scales = {}
+    for plots in self.plots:
+      for value in plots.values:
+        if value.expr:
+          continue
+        if self.col_scales.setdefault(value.col,value.scale) != value.scale:
+          self._error("different scale for column %d" % value.col,"plots")
+
+    # collect derived values (expression -> values) from subplots
+    self.derived = {}
+    for plots in self.plots:
+      for value in plots.values:
+        if value.expr:
+          self.derived.setdefault(value.expr,[]).append(value)
+
     self._get_layout()
     self.msg("DMConfigPlot: subplot-layout is %dx%d" % (self.rows,self.cols))
 
@@ -67,14 +116,88 @@ class DMConfigPlot(types.SimpleNamespace):
       self.options['dpi']     = 100
 
     if isinstance(self.title,dict):
-      self.title_opts = self.title
-      self.title      = self.title_opts['text']
-      del self.title_opts['text']
+      self.title_opts = dict(self.title)
+      self.title      = self.title_opts.pop('text',"")
+
+  # --- parse samples   ------------------------------------------------------
+
+  def _parse_samples(self):
+    """ parse samples-definition (the size is currently fixed) """
+
+    if isinstance(self.samples,dict):
+      self.samples = self.samples.get("max",self.samples.get("start"))
+    self._check_type("samples",(int,),optional=True)
+    if self.samples is not None:
+      self._check_min("samples",1)
 
   # --- calculate layout   ---------------------------------------------------
 
   def _get_layout(self):
     """ calculate layout """
 
-    if not hasattr(self,"rows"):
+    if not self.rows:
       self.rows = math.ceil(len(self.plots)/self.cols)
+    if self.rows*self.cols < len(self.plots):
+      self._error("layout %dx%d is too small for %d subplots" %
+                  (self.rows,self.cols,len(self.plots)),"rows")
+
+  # --- columns of the data used by the configuration   ----------------------
+
+  def columns(self):
+    """ return set of data-columns used by x-values, values and trigger """
+
+    cols = {self.x.col}
+    for plot in self.plots:
+      cols.add(plot.x.col)
+      cols.update(value.col for value in plot.values if not value.expr)
+    if self.trigger:
+      cols.add(self.trigger.col)
+    return cols
+
+  # --- check data-settings of another configuration   ----------------------
+
+  def _check_data(self,other):
+    """ check that another configuration uses compatible data-settings """
+
+    # only attributes of the x-definition which change the data
+    for key in self.DATA_KEYS_X:
+      if getattr(other.x,key) != getattr(self.x,key):
+        raise DMConfigError("x-attribute %r differs from the first "
+                            "configuration" % key)
+    if (other.trigger and other.trigger.asdict()) != (
+        self.trigger and self.trigger.asdict()):
+      raise DMConfigError("trigger differs from the first configuration")
+    for col,scale in other.col_scales.items():
+      if self.col_scales.get(col,scale) != scale:
+        raise DMConfigError("different scale for column %d" % col)
+
+  # --- merge data-settings of a configuration sharing the data   ------------
+
+  def merge(self,other):
+    """ merge data-related settings of another configuration (same data) """
+
+    self._check_data(other)
+    self.col_scaled.update(other.col_scaled)
+    self.col_scales.update(other.col_scales)
+    for expr,values in other.derived.items():
+      self.derived.setdefault(expr,[]).extend(values)
+
+    # keep enough samples for all configurations
+    self.samples = max([c.samples or c.width or 0 for c in (self,other)]) or None
+
+  # --- bind a configuration to existing data   ------------------------------
+
+  def rebind(self,other):
+    """ check that another configuration fits the data, assign derived cols """
+
+    self._check_data(other)
+    if self.samples and (other.samples or 0) > self.samples:
+      raise DMConfigError("more samples need a restart")
+    for col in other.col_scaled:
+      if col not in self.col_scaled:
+        raise DMConfigError("new scale for column %d needs a restart" % col)
+    for expr,values in other.derived.items():
+      if expr not in self.derived:
+        raise DMConfigError("new expression %r needs a restart" % expr)
+      for value in values:
+        value.col = self.derived[expr][0].col
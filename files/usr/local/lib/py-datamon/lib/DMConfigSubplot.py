@@ -9,15 +9,21 @@
 #
 # ----------------------------------------------------------------------------
 
-import types
-from lib import DMConfigValue, DMConfigAxis, DMConfigX
+import datetime
+from lib import DMConfigBase, DMConfigValue, DMConfigAxis, DMConfigX
 
 # --- configuration-object for subplots   ------------------------------------
 
-class DMConfigSubplot(types.SimpleNamespace):
-  def __init__(self,app,cfg_plot,conf):
+class DMConfigSubplot(DMConfigBase):
 
-    self.msg = app.msg
+  KEYS = ("title","legend","options","x","xaxis","yaxis","yaxis2","grid",
+          "render","values")
+
+  __slots__ = KEYS + ("title_opts","grid_opts","col_scaled")
+
+  def __init__(self,app,cfg_plot,conf,path="plots"):
+
+    super(DMConfigSubplot,self).__init__(app,path)
 
     # set defaults
     self.title      = ""
@@ -30,23 +36,37 @@ class DMConfigSubplot(types.SimpleNamespace):
     self.yaxis2     = cfg_plot.yaxis2
     self.grid       = cfg_plot.grid
     self.grid_opts  = cfg_plot.grid_opts
+    self.render     = cfg_plot.render
+    self.values     = None
 
     # override with data from config-file
-    super(DMConfigSubplot,self).__init__(**conf)
+    self._update(conf)
 
     # fix attributes if defaults were overridden
     if not isinstance(self.x,DMConfigX):
-      self.x  = DMConfigX(app,self.x)
+      self.x  = DMConfigX(app,self.x,path+".x")
     if not isinstance(self.xaxis,DMConfigAxis):
-      self.xaxis = DMConfigAxis(app,self.xaxis)
+      self.xaxis = DMConfigAxis(app,self.xaxis,path+".xaxis")
     if not isinstance(self.yaxis,DMConfigAxis):
-      self.yaxis = DMConfigAxis(app,self.yaxis)
+      self.yaxis = DMConfigAxis(app,self.yaxis,path+".yaxis")
     if self.yaxis2 and not isinstance(self.yaxis2,DMConfigAxis):
-      self.yaxis2 = DMConfigAxis(app,self.yaxis2)
+      self.yaxis2 = DMConfigAxis(app,self.yaxis2,path+".yaxis2")
+    self._check_limits(self.xaxis,"xaxis",self.x.type in ["date","datetime"])
+    self._check_limits(self.yaxis,"yaxis")
+    if self.yaxis2:
+      self._check_limits(self.yaxis2,"yaxis2")
+    self._check_choice("render",cfg_plot.RENDERERS)
+    self._check_type("legend",(dict,))
+    self._check_type("options",(dict,))
 
     # parse configuration for y-values
+    if not isinstance(self.values,list) or not self.values:
+      self._error("needs a list of values","values")
     self.msg("DMConfigSubplot: parsing config for %d y-values" % len(self.values))
-    self.values = [DMConfigValue(app,value) for value in self.values]
+    self.values = [DMConfigValue(app,value,"%s.values[%d]" % (path,i))
+                                           for i,value in enumerate(self.values)]
+    if self.yaxis2 is None and any(value.axis == 2 for value in self.values):
+      self._error("values for axis 2 need a yaxis2","values")
 
     # extract y-columns with scaling into a dict
     self.col_scaled = {}
@@ -55,11 +75,29 @@ class DMConfigSubplot(types.SimpleNamespace):
         self.col_scaled[value.col] = value.scale
 
     if isinstance(self.title,dict):
-      self.title_opts = self.title
-      self.title      = self.title_opts['text']
-      del self.title_opts['text']
+      self.title_opts = dict(self.title)
+      self.title      = self.title_opts.pop('text',"")
 
     if isinstance(self.grid,dict):
-      self.grid_opts = self.grid
-      self.grid      = self.grid_opts['visible']
-      del self.grid_opts['visible']
+      self.grid_opts = dict(self.grid)
+      self.grid      = self.grid_opts.pop('visible',True)
+
+  # --- check limits of an axis   --------------------------------------------
+
+  def _check_limits(self,axis,key,is_date=False):
+    """ check that limits are numbers (or date-strings for dates) """
+
+    for limit in ["min","max"]:
+      value = getattr(axis,limit)
+      if value is None:
+        continue
+      if not is_date:
+        if isinstance(value,bool) or not isinstance(value,(int,float)):
+          self._error("expected a number, got %r" % (value,),
+                      "%s.%s" % (key,limit))
+        continue
+      try:
+        datetime.datetime.strptime(value,"%Y-%m-%dT%H:%M:%S")
+      except (TypeError,ValueError):
+        self._error("expected a date like 2024-01-31T12:00:00, got %r" %
+                    (value,),"%s.%s" % (key,limit))
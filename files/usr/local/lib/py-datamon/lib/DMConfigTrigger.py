@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMConfigTrigger: configuration data for the trigger-mode
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+from lib import DMConfigBase
+
+# --- configuration-object for the trigger   ---------------------------------
+
+class DMConfigTrigger(DMConfigBase):
+
+  KEYS  = ("col","level","edge","pre","post","holdoff")
+  EDGES = ("rising","falling","both")
+
+  __slots__ = KEYS
+
+  def __init__(self,app,conf,path="trigger"):
+
+    super(DMConfigTrigger,self).__init__(app,path)
+
+    # set defaults
+    self.col     = 1
+    self.level   = 0.0
+    self.edge    = "rising"
+    self.pre     = 100          # samples before the trigger
+    self.post    = 400          # samples after the trigger (incl. trigger)
+    self.holdoff = 0            # samples after a capture without trigger
+
+    # override with data from config-file
+    self._update(conf)
+
+    self._check_min("col",0)
+    self._check_type("level",(int,float))
+    self._check_choice("edge",self.EDGES)
+    self._check_min("pre",0)
+    self._check_min("post",1)
+    self._check_min("holdoff",0)
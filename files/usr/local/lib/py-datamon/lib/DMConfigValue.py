@@ -9,30 +9,53 @@
 #
 # ----------------------------------------------------------------------------
 
-import types
+from lib import DMConfigBase
 
 # --- configuration-object for y-values   ------------------------------------
 
-class DMConfigValue(types.SimpleNamespace):
-  def __init__(self,app,conf):
+class DMConfigValue(DMConfigBase):
 
-    self.msg = app.msg
+  KEYS = ("col","expr","axis","label","color","scale","options")
+
+  __slots__ = KEYS + ("label_opts",)
+
+  def __init__(self,app,conf,path="value"):
+
+    super(DMConfigValue,self).__init__(app,path)
 
     # set defaults
+    self.col        = None
     self.axis       = 1
+    self.expr       = None
     self.label      = ""
     self.label_opts = {}
+    self.color      = None
     self.options    = {}
     self.scale      = 1
 
     # override with data from config-file
-    super(DMConfigValue,self).__init__(**conf)
+    self._update(conf)
+
+    if (self.col is None) == (self.expr is None):
+      self._error("needs either \"col\" or \"expr\"")
+    if self.col is not None:
+      self._check_min("col",0)
+    self._check_type("expr",(str,),optional=True)
+    self._check_choice("axis",(1,2))
+    self._check_type("scale",(int,float))
+    self._check_type("options",(dict,))
+
+    # derived value: column is assigned by DMData, scale is part of expr
+    if self.expr:
+      if self.scale != 1:
+        self.expr  = "(%s)*%r" % (self.expr,self.scale)
+        self.scale = 1
 
     # convert special attributes to options
-    if hasattr(self,"color"):
+    if self.color:
       self.options['color'] = self.color
 
     if isinstance(self.label,dict):
-      self.label_opts = self.label
-      self.label      = self.label_opts['text']
-      del self.label_opts['text']
+      self.label_opts = dict(self.label)
+      self.label      = self.label_opts.pop('text',"")
+    self._check_type("label",(str,))
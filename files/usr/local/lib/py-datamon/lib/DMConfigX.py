@@ -9,14 +9,20 @@
 #
 # ----------------------------------------------------------------------------
 
-import types
+from lib import DMConfigBase
 
 # --- configuration-object for x-value   -------------------------------------
 
-class DMConfigX(types.SimpleNamespace):
-  def __init__(self,app,conf):
+class DMConfigX(DMConfigBase):
 
-    self.msg = app.msg
+  KEYS  = ("col","type","format","normalize","scale","gap")
+  TYPES = ("plain","time","date","datetime")
+
+  __slots__ = KEYS
+
+  def __init__(self,app,conf,path="x"):
+
+    super(DMConfigX,self).__init__(app,path)
 
     # set defaults
     self.col       = 0
@@ -24,9 +30,19 @@ class DMConfigX(types.SimpleNamespace):
     self.format    = None       # ignored unless date/datime + live-plot
     self.normalize = False
     self.scale     = 1
+    self.gap       = None       # None: auto, 0: no gap-detection
 
     # override with data from config-file
-    super(DMConfigX,self).__init__(**conf)
+    self._update(conf)
+
+    self._check_min("col",0)
+    self._check_choice("type",self.TYPES)
+    self._check_type("format",(str,),optional=True)
+    self._check_type("normalize",(bool,))
+    self._check_type("scale",(int,float))
+    self._check_type("gap",(int,float),optional=True)
+    if self.gap is not None and self.gap < 0:
+      self._error("must not be negative, got %r" % self.gap,"gap")
 
     if self.format is None and self.type in ["date","datetime"]:
       if self.type == "datetime":
@@ -8,7 +8,52 @@
 #   - asynchronous for live-plots. Here a reader thread continuously
 #     reads data into a buffer. DMPlot will call DMData.update() from
 #     a second thread to update the internal numpy-array from the buffer
-#     whenever the function-animation routine is running
+#     whenever the function-animation routine is running. Readers within
+#     the same process can add numeric records directly (add_records())
+#
+# For huge csv-files and a configured window of the x-axis, a sparse index
+# (DMIndex) of the x-values is used to read only the region of the file
+# covering the window. DMPlot loads other windows when the plot is panned.
+#
+# Csv-files can also be replayed (start_replay()): the file is loaded like
+# a static file and a thread adds the records in batches when they are due.
+#
+# Growing csv-files (logs) are followed (start_follow()): the end of the
+# file is loaded like a static file, then a thread polls for appended lines
+# and reopens the file after rotation or truncation.
+#
+# In pipeline-mode (start_reader() with columns), the reader thread
+# replaces py-datareader.py: it checks the number of columns and appends a
+# numeric timestamp to every line, so no timestamp-strings are formatted
+# and parsed again.
+#
+# The data is stored column-major, i.e. self._data[col] is a contiguous
+# array with all values of a column. For every animation-frame, DMPlot
+# queries a snapshot (DMFrame) of the data.
+#
+# Snapshots are consistent and never change: for live-plots the array has
+# room for twice the number of samples. New samples are only written
+# behind the current window, and if the array is full, the newest samples
+# are copied to a new array. So every sample is copied at most once more,
+# and existing snapshots still reference the old array.
+#
+# Derived columns (expressions of the configuration) are computed for
+# every new block and stored behind the real columns.
+#
+# Invalid fields are stored as NaN in all modes. The minimum and maximum of
+# the columns ignore NaN, and the number of valid (non-NaN) values of every
+# column within the window is tracked incrementally.
+#
+# New blocks of live-data are checked for irregular x-values: samples with
+# decreasing x-values are dropped, gaps are separated by a sample with NaN
+# values (so lines are not connected) and a large backward jump (e.g. the
+# restart of a MCU) starts a new segment, i.e. the window restarts with
+# the new samples. Gaps and jumps are relative to the typical distance of
+# the x-values, unless the x-definition sets "gap".
+#
+# In trigger-mode, new blocks are searched for trigger-events instead. Only
+# the window around the latest complete trigger-event is published, with
+# x-values relative to the x-value of the trigger.
 #
 # Author: Bernhard Bablok
 # License: GPL3
@@ -17,39 +62,71 @@
 #
 # ----------------------------------------------------------------------------
 
-import os, sys, csv, threading, select
-import pandas as pd
+import os, sys, io, csv, threading, select, time, datetime
 import numpy as np
-import dateutil
 
-from pandas.api.types import is_numeric_dtype
+from lib import import_times, DMFrame, DMDerived, DMTimestamper, DMIndex
+from lib import DMConfigError
+
+# note: pandas and dateutil are imported on demand. pandas is only
+# necessary for static plots (csv-files), dateutil only for date/datetime
+# x-values in live-plots.
 
 # --- data management for the application   ----------------------------------
 
 class DMData:
   """ data holder and management """
 
+  # --- constants   ----------------------------------------------------------
+
+  READ_SIZE    = 65536  # maximal number of bytes per read (pipeline-mode)
+  REPLAY_TICK  = 0.01   # minimal interval between batches (replay)
+  REPLAY_BATCH = 1000   # records per batch (replay as fast as possible)
+  FOLLOW_TICK  = 0.1    # poll-interval for appended lines (follow)
+  GAP_FACTOR   = 10     # gap: multiple of the median distance of x-values
+  GAP_SAMPLES  = 256    # number of x-values for the median distance
+
   # --- constructor   --------------------------------------------------------
 
   def __init__(self,app):
     """ constructor """
 
+    self._app    = app
     self.msg     = app.msg
     self.debug   = app.debug
+    self._stats  = app.stats
     self._config = app.config
     self._wait   = app.WAIT_INTERVAL
 
     # set defaults
 
     self.new_data      = False
+    self.x_origin      = None
     self.lock          = threading.Lock()
     self._data         = None
     self._buffer       = []
     self._min_max      = None
+    self._valid        = None           # valid values per column (window)
     self._data_labels  = None
     self._index_low    = 0
-    self._index_high   = -1
-    self._x_low        = -1
+    self._index_high   = 0
+    self._samples      = 0
+    self._scale        = None
+    self._offset       = None
+    self._scale_rows   = None
+    self._trigger      = self._config.trigger
+    self._tail         = None           # samples kept for the next trigger
+    self._tail_start   = 0              # sample-number of the tail
+    self._next_trigger = 0              # first sample-number for a trigger
+    self.version       = 0
+    self.segment       = 0              # number of resets of the x-values
+    self._last_x       = np.nan         # last x-value (live-data)
+    self._recent_x     = np.empty(0)    # latest x-values (gap-detection)
+    self.index         = None           # index of huge csv-files
+    self.window        = None           # x-range of the loaded window
+    self._n_cols       = 0
+    self._derived      = DMDerived(self._app,self._config.derived,
+                                   self._config.x.col)
 
   # --- get item   -----------------------------------------------------------
 
@@ -57,9 +134,9 @@ class DMData:
     """ return slice of data """
 
     if isinstance(key,int):
-      return self._data[self._index_low:self._index_high,key]
+      return self.snapshot()[key]
     else:
-      return self._data[key[0],key[1]]
+      return self._data[key[1],key[0]]
 
   # --- set item   -----------------------------------------------------------
 
@@ -67,9 +144,9 @@ class DMData:
     """ return slice of data """
 
     if isinstance(key,int):
-      self._data[key] = value
+      self._data[:,key] = value
     else:
-      self._data[key[0],key[1]] = value
+      self._data[key[1],key[0]] = value
 
   # --- get delimiter of csv-data   ------------------------------------------
 
@@ -129,28 +206,182 @@ class DMData:
         elif line.startswith('#'):
           continue
         else:
-          self._add_data(line.rstrip())
+          self._parse_line(line.rstrip())
+
+  # --- parse line   ---------------------------------------------------------
+
+  def _parse_line(self,line):
+    """ add line to the buffer, update statistics """
+
+    if self._stats:
+      start = time.perf_counter()
+      self._add_data(line)
+      self._stats.observe("parse",time.perf_counter()-start)
+      self._stats.count("lines_read")
+    else:
+      self._add_data(line)
+
+  # --- read data and add timestamps   ----------------------------------------
+
+  def _read_stamped(self):
+    """ read data in chunks, check columns and add timestamps """
+
+    if self._input == "-":
+      self.msg("DMData: reading data from stdin (pipeline-mode)")
+      fd = sys.stdin.fileno()
+    else:
+      self.msg("DMData: reading data from %s (pipeline-mode)" % self._input)
+      fd = os.open(self._input,os.O_RDONLY|os.O_NONBLOCK)
+
+    rest = b""
+    while True:
+      fd_ready = select.select([fd],[],[],self._wait)[0]
+      if self._stop_event.is_set():
+        self.msg("DMData: request to stop reading")
+        break
+      if not fd_ready:
+        continue
+      try:
+        chunk = os.read(fd,self.READ_SIZE)
+      except BlockingIOError:
+        continue
+      if chunk:
+        lines = (rest+chunk).split(b"\n")
+        rest  = lines.pop()
+      else:
+        lines = [rest]           # EOF
+      self.add_records(self._stamp_lines(lines))
+      if not chunk:
+        break
+
+  # --- check lines and add timestamps   -------------------------------------
+
+  def _stamp_lines(self,lines):
+    """ convert complete lines to records with an additional timestamp """
+
+    records = []
+    for line in lines:
+      line = line.decode(errors="replace").rstrip()
+      if not line or line.startswith('#'):
+        continue
+      if self._stats:
+        start = time.perf_counter()
+
+      if self._data is None:
+        self._delim,_,_ = self._get_delim(line=line)
+        self.msg("DMData: delimiter is: '%s'" % self._delim)
+        self._create_data(self._columns+1)
+        words = line.split(self._delim)
+        if self._check_header(words) == 1:
+          self.msg("DMData: dropping csv-header: %r" % (words,))
+          self._data_labels = words
+          continue
+
+      words = line.split(self._delim)
+      if len(words) != self._columns or not words[0]:
+        self.msg("DMData: dropping incomplete line: %r" % (words,))
+        if self._stats:
+          self._stats.count("lines_read")
+          self._stats.count("lines_dropped")
+        continue
+      words.append(self._stamper.now())
+      records.append(self._to_floats(words))
+      if self._stats:
+        self._stats.observe("parse",time.perf_counter()-start)
+    return records
 
   # --- convert data   -------------------------------------------------------
 
   def _convert_data(self,words):
-    """ convert data from string """
+    """ convert data from string, invalid fields are converted to NaN """
 
-    if self._config.x.type in ["date","datetime"]:
-      # manual conversion of data
-      for i,word in enumerate(words):
-        try:
-          words[i] = float(word)
-        except:
-          if i == self._config.x.col:
-            words[i] = dateutil.parser.parse(words[i]).timestamp()
-          else:
-            # make numeric (expect char-columns to be ignored anyhow)
-            words[i] = 0
-      return words
+    x_col = self._config.x.col
+    if self._config.x.type in ["date","datetime"] and x_col < len(words):
+      words[x_col] = self._to_timestamp(words[x_col])
+    return self._to_floats(words)
+
+  # --- convert date   -------------------------------------------------------
+
+  def _to_timestamp(self,word):
+    """ convert numeric or date-string to a unix-timestamp, else NaN """
+
+    try:
+      return float(word)
+    except ValueError:
+      pass
+    from dateutil import parser
+    try:
+      return parser.parse(word).timestamp()
+    except (ValueError,OverflowError):
+      return np.nan
+
+  # --- convert fields   -----------------------------------------------------
+
+  def _to_floats(self,words):
+    """ convert fields to floats, non-numeric fields are converted to NaN """
+
+    try:
+      return np.array(words,dtype=float)
+    except ValueError:
+      return np.array([self._to_float(word) for word in words])
+
+  # --- convert single field   -----------------------------------------------
+
+  def _to_float(self,word):
+    """ convert single field to float, use NaN for invalid data """
+
+    try:
+      return float(word)
+    except ValueError:
+      return np.nan
+
+  # --- create numpy-buffer   ------------------------------------------------
+
+  def _create_data(self,n_cols):
+    """ estimate buffer size and create numpy-buffer for n_cols columns """
+
+    n = self._n_samples()
+    self.msg("DMData: create numpy-buffer with %d records" % n)
+    self._derived.assign(n_cols)
+    self._n_cols  = n_cols
+    self._samples = n
+    self._data    = np.zeros((self._n_cols+len(self._derived),2*n))
+    self._min_max = np.zeros((2,self._data.shape[0]))
+    self._valid   = np.zeros(self._data.shape[0],dtype=int)
+
+  # --- number of samples of live-plots   ------------------------------------
+
+  def _n_samples(self):
+    """ return number of samples of the live-window """
+
+    if self._config.samples:
+      return self._config.samples
+    elif self._config.width:
+      return self._config.width
     else:
-      # automatic conversion
-      return pd.to_numeric(words,errors='coerce')
+      return 500
+
+  # --- add numeric records to the internal data-buffer   ---------------------
+
+  def add_records(self,records):
+    """ add numeric records (e.g. from an in-process reader) to the buffer """
+
+    if not len(records):
+      return
+    if self._data is None:
+      self._create_data(len(records[0]))
+
+    valid = [record for record in records if len(record) == self._n_cols]
+    if len(valid) < len(records):
+      self.msg("DMData: dropping %d incomplete records" %
+               (len(records)-len(valid)))
+    if self._stats:
+      self._stats.count("lines_read",len(records))
+      self._stats.count("lines_dropped",len(records)-len(valid))
+
+    with self.lock:
+      self.new_data = True
+      self._buffer.extend(valid)
 
   # --- add data to the internal data-buffer   --------------------------------
 
@@ -167,17 +398,7 @@ class DMData:
       self._delim,_,_ = self._get_delim(line=line)
       self.msg("DMData: delimiter is: '%s'" % self._delim)
       words = next(csv.reader([line],delimiter=self._delim))
-
-      # estimate buffer size and create numpy-buffer
-      if self._config.samples:
-        n = self._config.samples
-      elif self._config.width:
-        n = self._config.width
-      else:
-        n = 500
-      self.msg("DMData: create numpy-buffer with %d records" % n)
-      self._data    = np.zeros((n,len(words)))
-      self._min_max = pd.DataFrame(index=range(3),columns=range(len(words)))
+      self._create_data(len(words))
 
       # check for header
       if self._check_header(words) == 1:
@@ -191,10 +412,11 @@ class DMData:
 
     # convert data
     data_line = self._convert_data(words)
-    if len(data_line) != self._data.shape[1]:
+    if len(data_line) != self._n_cols:
       self.msg("DMData: dropping incomplete line: %r" % (words,))
+      if self._stats:
+        self._stats.count("lines_dropped")
       return
-    self._scale_record(data_line)
 
     # add to internal buffer
     with self.lock:
@@ -208,39 +430,236 @@ class DMData:
     """ update internal data from buffer (called from DMPlot-thread) """
 
     # resize numpy-buffer if necessary
-    if self._index_high == self._data.shape[0]:
+    if self._index_high - self._index_low == self._samples:
       self._resize_data()
 
-    # copy buffer to data
+    # fetch buffer (keep the lock as short as possible)
+    start = time.perf_counter()
     with self.lock:
-      n_new = len(self._buffer)
-      self.msg("DMData: updating data with %d samples from buffer" % n_new)
-
-      for data_line in self._buffer:
-        # track min and max
-        if self._index_high == -1:
-          self._min_max.iloc[0] = data_line
-          self._min_max.iloc[1] = data_line
-        else:
-          self._min_max.iloc[2] = data_line                 # current sample
-          self._min_max.iloc[0] = self._min_max.min()       # update minimum
-          self._min_max.iloc[1] = self._min_max.max()       # update maximum
-
-        # roll data if necessary
-        if self._index_high == self._data.shape[0]-1:
-          self._data = np.roll(self._data,-1,0)
-          self._min_max[0][self._config.x.col] = self._data[0][self._config.x.col]
-          self._min_max[1][self._config.x.col] = self._data[self._index_high][self._config.x.col]
-        else:
-          self._index_high += 1
-
-        # finally save new observation
-        self._data[self._index_high,:] = data_line
-
-      # reset buffer and return lines added
-      self._buffer = []
+      if self._stats:
+        locked = time.perf_counter()
+        self._stats.observe("lock_wait",locked-start)
+      buffer        = self._buffer
+      self._buffer  = []
       self.new_data = False
-      return n_new
+
+    n_new = len(buffer)
+    self.msg("DMData: updating data with %d samples from buffer" % n_new)
+    if n_new:
+      # copy buffer to data and publish the new state
+      block = self._scale_block(np.array(buffer).T)
+      if self._stats:
+        self._stats.count("nan_values",int(np.isnan(block).sum()))
+      if self._trigger:
+        state = self._capture(self._derived.extend(block))
+      else:
+        # derived columns only see the checked x-values and restart with
+        # a new segment
+        (block,reset) = self._check_x(block)
+        if reset:
+          self._derived = DMDerived(self._app,self._config.derived,
+                                    self._config.x.col)
+          self._derived.assign(self._n_cols)
+        state = None
+        if block.shape[1]:
+          state = self._insert(self._derived.extend(block),reset)
+      if state:
+        with self.lock:
+          (self._data,self._index_low,self._index_high,self._min_max,
+           self._valid) = state
+          self.version += 1
+
+    if self._stats:
+      self._stats.set("buffer_depth",n_new)
+      self._stats.count("samples",n_new)
+      self._stats.observe("update",time.perf_counter()-locked)
+    return n_new
+
+  # --- insert block of data   -----------------------------------------------
+
+  def _insert(self,block,reset=False):
+    """ append block (columns x samples), return the new state """
+
+    if self.x_origin is None or reset:
+      self.x_origin = block[self._config.x.col,0]
+
+    # track min and max (ignoring NaN) and the number of valid values
+    b_min   = np.fmin.reduce(block,axis=1)
+    b_max   = np.fmax.reduce(block,axis=1)
+    b_valid = self._count_valid(block)
+    if self._index_high == self._index_low or reset:
+      min_max = np.vstack((b_min,b_max))
+    else:
+      min_max = np.vstack((np.fmin(self._min_max[0],b_min),
+                           np.fmax(self._min_max[1],b_max)))
+
+    data  = self._data
+    low   = self._index_low
+    high  = self._index_high
+    if reset:
+      low = high                  # new segment: restart with an empty window
+    (old,old_low,n_old) = (data,low,high-low)
+    n_new = block.shape[1]
+    if high + n_new <= data.shape[1]:
+      # behind the window: invisible for existing snapshots
+      data[:,high:high+n_new] = block
+      high += n_new
+    else:
+      # array is full: copy newest samples to a new array
+      n_copy = min(n_new,self._samples)
+      n_keep = min(high-low,self._samples-n_copy)
+      new    = np.empty_like(data)
+      new[:,:n_keep]              = data[:,high-n_keep:high]
+      new[:,n_keep:n_keep+n_copy] = block[:,-n_copy:]
+      data,low,high = new,0,n_keep+n_copy
+
+    # roll data if necessary
+    if high - low >= self._samples:
+      low   = high - self._samples
+      x_col = self._config.x.col
+      min_max[0,x_col] = data[x_col,low]
+      min_max[1,x_col] = data[x_col,high-1]
+
+    # valid values: subtract the samples removed from the front of the old
+    # window and the new block
+    valid  = b_valid + (self._valid if n_old else 0)
+    n_drop = n_old + n_new - (high - low)
+    if n_drop > n_old:
+      valid = b_valid - self._count_valid(block[:,:n_drop-n_old])
+    elif n_drop:
+      valid = valid - self._count_valid(old[:,old_low:old_low+n_drop])
+    return data,low,high,min_max,valid
+
+  # --- count valid values   -------------------------------------------------
+
+  def _count_valid(self,block):
+    """ return number of valid (non-NaN) values of every column """
+
+    return block.shape[1] - np.count_nonzero(np.isnan(block),axis=1)
+
+  # --- check x-values of a block   -----------------------------------------
+
+  def _check_x(self,block):
+    """ drop invalid or unordered x, separate gaps, return (block,reset) """
+
+    # samples without a valid x-value are dropped (invalid y-values are
+    # kept as NaN)
+    x_col = self._config.x.col
+    valid = ~np.isnan(block[x_col])
+    if not valid.all():
+      block = block[:,valid]
+      if self._stats:
+        self._stats.count("invalid_x",
+                          int(len(valid)-np.count_nonzero(valid)))
+
+    x     = block[x_col]
+    limit = self._gap_limit(x)
+    if not limit:
+      self._last_x = np.fmax.reduce(np.concatenate(([self._last_x],x)))
+      return (block,False)
+
+    # reset: backward jump larger than a gap, keep the latest segment
+    last   = self._last_x
+    prev   = np.concatenate(([last],x[:-1]))
+    resets = np.flatnonzero(prev - x > limit)
+    reset  = len(resets) > 0
+    if reset:
+      self.segment += 1
+      self.msg("DMData: x-values were reset (%g -> %g), new segment" %
+               (prev[resets[-1]],x[resets[-1]]))
+      block = block[:,resets[-1]:]
+      x     = block[x_col]
+      last  = np.nan
+
+    # drop samples behind the maximum of the preceding x-values
+    top  = np.fmax.accumulate(np.concatenate(([last],x)))[:-1]
+    keep = ~(x < top)
+    if not keep.all():
+      block = block[:,keep]
+      x     = block[x_col]
+
+    # separate gaps by a sample with NaN values (and the previous x-value)
+    prev = np.concatenate(([last],x[:-1]))
+    gaps = np.flatnonzero(x - prev > limit)
+    if len(gaps):
+      separators = np.full((block.shape[0],len(gaps)),np.nan)
+      separators[x_col] = prev[gaps]
+      block = np.insert(block,gaps,separators,axis=1)
+
+    self._last_x = np.fmax.reduce(np.concatenate(([last],x)))
+    if self._stats:
+      self._stats.count("resets",len(resets))
+      self._stats.count("unordered",int(len(keep)-np.count_nonzero(keep)))
+      self._stats.count("gaps",len(gaps))
+    return (block,reset)
+
+  # --- limit of the distance of x-values   ----------------------------------
+
+  def _gap_limit(self,x):
+    """ return minimal distance of x-values for a gap (None: unknown) """
+
+    if self._config.x.gap is not None:
+      return self._config.x.gap
+
+    # multiple of the median distance of the latest x-values
+    recent = np.concatenate((self._recent_x,x[-self.GAP_SAMPLES:]))
+    self._recent_x = recent[-self.GAP_SAMPLES:]
+    dx = np.diff(self._recent_x)
+    dx = dx[dx > 0]
+    if len(dx) < 2:
+      return None
+    return self.GAP_FACTOR*np.median(dx)
+
+  # --- search trigger and capture window   ----------------------------------
+
+  def _capture(self,block):
+    """ search trigger in block, return state of the latest capture or None """
+
+    trigger = self._trigger
+    if self._tail is None:
+      data = block
+    else:
+      data = np.hstack((self._tail,block))
+    base = self._tail_start              # sample-number of data[:,0]
+    n    = data.shape[1]
+
+    # find all crossings of the trigger-level (position of the new sample)
+    values = data[trigger.col]
+    (prev,cur) = (values[:-1],values[1:])
+    if trigger.edge == "rising":
+      hits = (prev < trigger.level) & (cur >= trigger.level)
+    elif trigger.edge == "falling":
+      hits = (prev > trigger.level) & (cur <= trigger.level)
+    else:
+      hits = ((prev < trigger.level) & (cur >= trigger.level) |
+              (prev > trigger.level) & (cur <= trigger.level))
+    hits = np.flatnonzero(hits) + 1
+    hits = hits[hits >= self._next_trigger - base]
+
+    # capture window around the latest complete trigger
+    state    = None
+    complete = hits[hits + trigger.post <= n]
+    if len(complete):
+      pos    = complete[-1]
+      window = data[:,max(0,pos-trigger.pre):pos+trigger.post].copy()
+      x_col  = self._config.x.col
+      window[x_col] -= data[x_col,pos]
+      min_max = np.vstack((np.fmin.reduce(window,axis=1),
+                           np.fmax.reduce(window,axis=1)))
+      state   = (window,0,window.shape[1],min_max,self._count_valid(window))
+      self._next_trigger = base + pos + trigger.post + trigger.holdoff
+      hits = hits[hits >= self._next_trigger - base]
+      if self._stats:
+        self._stats.count("captures")
+
+    # keep samples for the pre-trigger window (and the previous sample)
+    keep = n - trigger.pre - 1
+    if len(hits):
+      keep = min(keep,hits[0] - trigger.pre - 1)
+    keep = min(n,max(0,keep,self._next_trigger - base - trigger.pre - 1))
+    self._tail       = data[:,keep:]
+    self._tail_start = base + keep
+    return state
 
   # --- resize numpy-array   --------------------------------------------------
 
@@ -248,48 +667,171 @@ class DMData:
     """ resize numpy array """
     pass
 
-  # --- scale and normalize record   -----------------------------------------
+  # --- create scale and offset   -------------------------------------------
 
-  def _scale_record(self,record):
-    """ scale and normalize single record """
+  def _create_scale(self,block):
+    """ create scale- and offset-vectors from the first block (with x) """
 
-    # normalize data (i.e. first observation to timestamp = 0)
-    if self._config.x.normalize:
-      if self._x_low < 0:                   # true only for very first record
-        self._x_low = record[self._config.x.col]
-      record[self._config.x.col] -= self._x_low
+    # normalize needs a valid x-value (e.g. the first line is garbled)
+    x_col = self._config.x.col
+    x     = block[x_col][np.isfinite(block[x_col])]
+    if self._config.x.normalize and not len(x):
+      return
 
-    # scale data (eg. from ms to s)
-    if self._config.x.scale != 1:
-      record[self._config.x.col] *= self._config.x.scale
+    scale  = np.ones(block.shape[0])
+    offset = np.zeros(block.shape[0])
 
     # scale values
-    for col,scale in self._config.col_scaled.items():
-      record[col] *= scale
+    for col,factor in self._config.col_scaled.items():
+      scale[col] = factor
 
-  # --- scale and normalize data   -------------------------------------------
+    # scale x-axis (eg. from ms to s) and normalize (first x-value is 0)
+    scale[x_col] = self._config.x.scale
+    if self._config.x.normalize:
+      offset[x_col] = -float(x[0])*scale[x_col]
 
-  def _scale_data(self):
-    """ scale and normalize data """
+    # only keep rows which need scaling
+    rows = np.flatnonzero((scale != 1) | (offset != 0))
+    self._scale_rows = rows if len(rows) else None
+    self._scale      = scale[rows,None]
+    self._offset     = offset[rows,None]
 
-    # normalize x-axis (i.e. first observation to timestamp = 0)
-    if self._config.x.normalize:
-      x_low = self._data[0,self._config.x.col]
-      self._data[:,self._config.x.col] -= x_low
+  # --- scale and normalize block   ------------------------------------------
 
-    # scale x-axis (eg. from ms to s)
-    if self._config.x.scale != 1:
-      self._data[:,self._config.x.col] *= self._config.x.scale
+  def _scale_block(self,block):
+    """ scale and normalize block (columns x samples) in place """
 
-    # scale values
-    for col,scale in self._config.col_scaled.items():
-      self._data[:,col] *= scale
+    if self._scale is None:
+      self._create_scale(block)
+      if self._scale is None:
+        return block                   # no valid x-value yet
+    if self._scale_rows is not None:
+      rows = self._scale_rows
+      block[rows] = block[rows]*self._scale + self._offset
+    return block
 
   # --- read data from csv-file   --------------------------------------------
 
   def import_file(self,file):
     """ read data from csv file """
 
+    window = self._x_window(file)
+    if window:
+      self.load_window(*window)
+    else:
+      self._set_data(self._load_file(file))
+
+  # --- load window of x-values from csv file   ------------------------------
+
+  def load_window(self,xmin,xmax):
+    """ read the region of the csv file with x-values xmin..xmax (unscaled) """
+
+    (start,end,lo,hi) = self.index.lookup(xmin,xmax)
+    self.msg("DMData: reading bytes %d-%d for x-values %g..%g" %
+             (start,end,xmin,xmax))
+    data = self._load_file(self.index.file,(start,end))
+
+    # functions of derived columns must not continue the last window
+    self._derived = DMDerived(self._app,self._config.derived,
+                              self._config.x.col)
+    self._set_data(data)
+    self.window = (lo,hi)
+
+  # --- set data of a csv file   ---------------------------------------------
+
+  def _set_data(self,data):
+    """ scale data and add derived columns, publish the data """
+
+    # normalize and scale data, add derived columns
+    self._scale_block(data)
+    self._n_cols = data.shape[0]
+    self._derived.assign(self._n_cols)
+    data = self._derived.extend(data)
+
+    min_max = np.vstack((np.fmin.reduce(data,axis=1),
+                         np.fmax.reduce(data,axis=1)))
+    valid   = self._count_valid(data)
+
+    # set low/high indices (for csv-files, we use the complete data)
+    with self.lock:
+      (self._data,self._index_low,self._index_high) = (data,0,data.shape[1])
+      (self._min_max,self._valid) = (min_max,valid)
+      self.x_origin = data[self._config.x.col,0]
+      self.version += 1
+
+  # --- configured window of x-values   --------------------------------------
+
+  def _x_window(self,file):
+    """ return configured window of x-values (unscaled), create index """
+
+    config = self._config
+    if (os.path.getsize(file) < DMIndex.MIN_SIZE or config.x.normalize or
+        any(plot.x.col != config.x.col for plot in config.plots)):
+      return None
+
+    # the window must cover the x-axis of all subplots
+    lows  = [self._x_raw(plot.xaxis.min) for plot in config.plots]
+    highs = [self._x_raw(plot.xaxis.max) for plot in config.plots]
+    xmin  = -np.inf if None in lows else min(lows)
+    xmax  = np.inf if None in highs else max(highs)
+    if xmin == -np.inf and xmax == np.inf:
+      return None
+
+    delim,_,_ = self._get_delim(file=file)
+    is_date   = config.x.type in ["date","datetime"]
+    index     = DMIndex(self,file,delim,config.x.col,self._x_seconds,is_date)
+    if not index.valid:
+      self.msg("DMData: x-values of %s are not increasing, reading "
+               "complete file" % file,force=True)
+      return None
+    self.index = index
+    return (xmin,xmax)
+
+  # --- convert limit of the x-axis   ----------------------------------------
+
+  def _x_raw(self,limit):
+    """ convert configured limit of the x-axis to an unscaled x-value """
+
+    if limit is None:
+      return None
+    if self._config.x.type in ["date","datetime"]:
+      return datetime.datetime.strptime(limit,"%Y-%m-%dT%H:%M:%S").timestamp()
+    return limit/self._config.x.scale
+
+  # --- convert x-fields   ---------------------------------------------------
+
+  def _x_seconds(self,words):
+    """ convert x-fields to floats (dates to unix-timestamps), else NaN """
+
+    import pandas as pd
+    x = pd.to_numeric(pd.Series(words),errors="coerce")
+    if self._config.x.type in ["date","datetime"] and x.isna().all():
+      x = self._to_seconds(pd.Series(words),errors="coerce")
+    return x.to_numpy(dtype=float)
+
+  # --- convert dates   ------------------------------------------------------
+
+  def _to_seconds(self,x,errors="raise"):
+    """ convert series of date-strings to unix-timestamps """
+
+    import pandas as pd
+    from dateutil import tz
+    x = pd.to_datetime(x,errors=errors)
+    if x.dt.tz is None:
+      x = x.dt.tz_localize(tz.tzlocal(),ambiguous='NaT',
+                           nonexistent='shift_forward')
+    return (x - pd.Timestamp("1970-01-01",tz="UTC"))/pd.Timedelta(seconds=1)
+
+  # --- load csv file   ------------------------------------------------------
+
+  def _load_file(self,file,window=None):
+    """ load csv file (or the byte-range window) into a numpy-array """
+
+    start = time.perf_counter()
+    import pandas as pd
+    from pandas.api.types import is_numeric_dtype
+    import_times.setdefault("pandas",time.perf_counter()-start)
+
     self.msg("DMData: reading data from %s" % file)
     delim,line,header_comments = self._get_delim(file=file)
     self.msg("DMData: delimiter is: '%s'" % delim)
@@ -303,52 +845,262 @@ class DMData:
       self.msg("DMData: dropping csv-header: %r" % (words,))
       self._data_labels = words
 
+    # read the window (header and comments are only at the start)
+    source = file
+    if window:
+      (start,end) = window
+      with open(file,"rb") as f:
+        f.seek(start)
+        source = io.BytesIO(f.read(end-start))
+      if start:
+        (skiprows,header_comments) = (0,0)
+
     # using pandas to read the data, because it is more robust
     # then np.genfromtxt ...
-    self._data = pd.read_csv(file,header=None,comment='#',
-                             skiprows=skiprows+header_comments,sep=delim)
+    data = pd.read_csv(source,header=None,comment='#',
+                       skiprows=skiprows+header_comments,sep=delim)
     if self.debug:
-      self.msg("DMData: total data-rows: %d" % self._data.shape[0])
+      self.msg("DMData: total data-rows: %d" % data.shape[0])
       print("-"*75)
-      print(self._data.head(10))
+      print(data.head(10))
       print("-"*75)
 
-    # convert x to date/datetime
-    if self._config.x.type in ["date","datetime"]:
-      if is_numeric_dtype(self._data[self._config.x.col].dtypes):
-        # assume unix-timestamp-value
-        self._data[self._config.x.col] = pd.to_datetime(
-          self._data[self._config.x.col],unit='s')
-      else:
-        self._data[self._config.x.col] = pd.to_datetime(
-          self._data[self._config.x.col])
+    # convert date/datetime to unix-timestamps (numeric values are
+    # already unix-timestamps, strings without timezone are local time)
+    x_col = self._config.x.col
+    if (self._config.x.type in ["date","datetime"] and
+        not is_numeric_dtype(data[x_col].dtypes)):
+      data[x_col] = self._to_seconds(data[x_col])
 
-    # ... but convert to numpy-array, because a dataframe is not
-    # thread-safe
-    self._data = self._data.to_numpy()
-    # set low/high indices (for csv-files, we use the complete data)
-    self._index_low  = 0
-    self._index_high = self._data.shape[0]
+    # non-numeric fields are converted to NaN (like for live-data)
+    for col in data.columns:
+      if not is_numeric_dtype(data[col].dtypes):
+        data[col] = pd.to_numeric(data[col],errors="coerce")
 
-    # normalize and scale data
-    self._scale_data()
+    # ... but convert to numpy-array (column-major), because a dataframe
+    # is not thread-safe
+    return np.ascontiguousarray(data.to_numpy().T)
 
   # --- start reader thread for dynamic data   -------------------------------
 
-  def start_reader(self,input,stop_event):
-    """ start reader thread """
+  def start_reader(self,input,stop_event,columns=0):
+    """ start reader thread, add timestamps to lines with the given columns """
 
     self._input      = input
     self._stop_event = stop_event
+    self._columns    = columns
+
+    if columns:
+      self._stamper = DMTimestamper()
+      reader_thread = threading.Thread(target=self._read_stamped)
+    else:
+      reader_thread = threading.Thread(target=self._read_continuous)
+    reader_thread.start()
+    return reader_thread
+
+  # --- check columns of a configuration   ----------------------------------
+
+  def check_columns(self,config):
+    """ check that the data has all columns used by the configuration """
+
+    missing = sorted(c for c in config.columns() if c >= self._n_cols)
+    if missing:
+      raise DMConfigError("configuration uses column(s) %s, but data has "
+                          "%d columns" % (", ".join(map(str,missing)),
+                                          self._n_cols))
+
+  # --- check configuration with sample data   ------------------------------
+
+  def check_sample(self,lines,columns=0):
+    """ check configuration against sample lines, return number of records """
+
+    if columns:
+      # pipeline-mode: lines with timestamps
+      self._columns = columns
+      self._stamper = DMTimestamper()
+      self.add_records(self._stamp_lines([line.encode() for line in lines]))
+    else:
+      for line in lines:
+        line = line.rstrip()
+        if line and not line.startswith('#'):
+          self._add_data(line)
+    if self._data is None:
+      raise DMConfigError("no data in sample")
+
+    self.check_columns(self._config)
+
+    # check the x-values before irregular x-values are removed
+    if not self._buffer:
+      raise DMConfigError("no valid records in sample")
+    x = np.array(self._buffer)[:,self._config.x.col]
+
+    # check the records without searching trigger-events
+    self._trigger = None
+    self.update()
+    if np.isnan(x).all():
+      raise DMConfigError("x-values (column %d) are not numeric, "
+                          "check the x-type" % self._config.x.col)
+    if (np.diff(x) < 0).any():
+      self.msg("DMData: warning: x-values are not increasing",force=True)
+    return len(x)
+
+  # --- start replay thread for a csv file   --------------------------------
+
+  def start_replay(self,file,stop_event,speed=0,rate=0):
+    """ start thread replaying a csv file like live data """
+
+    self._stop_event = stop_event
+    records = self._load_file(file)
+    if rate:
+      self.msg("DMData: replaying %s with %g records/s" % (file,rate))
+    elif speed:
+      self.msg("DMData: replaying %s with speed %g" % (file,speed))
+    else:
+      self.msg("DMData: replaying %s as fast as possible" % file)
+    due = self._replay_due(records,speed,rate)
+
+    reader_thread = threading.Thread(target=self._replay,args=(records,due))
+    reader_thread.start()
+    return reader_thread
+
+  # --- due-times of replayed records   --------------------------------------
+
+  def _replay_due(self,records,speed,rate):
+    """ return time of every record relative to the start of the replay """
+
+    if rate:
+      return np.arange(records.shape[1])/rate
+    elif speed:
+      # x-values in seconds (dates are already converted to timestamps)
+      x = records[self._config.x.col]*self._config.x.scale
+      return np.nan_to_num(np.fmax.accumulate((x-x[0])/speed))
+    else:
+      return None
+
+  # --- start follow thread for a growing csv file   ------------------------
+
+  def start_follow(self,file,stop_event):
+    """ load the end of a growing csv file and start a thread following it """
+
+    self._input      = file
+    self._stop_event = stop_event
 
-    reader_thread = threading.Thread(target=self._read_continuous)
+    # find the end of the last complete line
+    with open(file,"rb") as f:
+      size  = f.seek(0,os.SEEK_END)
+      f.seek(max(0,size-self.READ_SIZE))
+      chunk = f.read()
+    end = size - len(chunk) + chunk.rfind(b"\n") + 1
+
+    # load enough lines for the live-window like a static file (unless
+    # the file is empty or only has a header)
+    lines = [line for line in
+             chunk[:chunk.rfind(b"\n")+1].decode(errors="replace").splitlines()
+             if line.strip() and not line.startswith('#')]
+    if lines:
+      self._delim,_,_ = self._get_delim(file=file)
+    if any(not self._check_header(line.split(self._delim)) for line in lines):
+      line_size = len(chunk)/max(1,chunk.count(b"\n"))
+      start     = max(0,end-int(2*self._n_samples()*line_size))
+      if start:
+        with open(file,"rb") as f:
+          f.seek(start-1)
+          f.readline()                     # skip partial line
+          start = f.tell()
+      records = self._load_file(file,(start,end))
+      self._create_data(records.shape[0])
+      self.add_records(records[:,-self._samples:].T)
+
+    self.msg("DMData: following %s from byte %d" % (file,end))
+    reader_thread = threading.Thread(target=self._follow,args=(end,))
     reader_thread.start()
     return reader_thread
 
+  # --- follow file   --------------------------------------------------------
+
+  def _follow(self,pos):
+    """ poll for appended lines, reopen file after rotation or truncation """
+
+    f = open(self._input,"rb",buffering=0)
+    f.seek(pos)
+    ino    = os.fstat(f.fileno()).st_ino
+    rest   = b""
+    header = False                         # check for header (new file)
+    while not self._stop_event.is_set():
+      chunk = f.read(self.READ_SIZE)
+      if chunk:
+        lines = (rest+chunk).split(b"\n")
+        rest  = lines.pop()
+        for line in lines:
+          line = line.decode(errors="replace").rstrip()
+          if not line or line.startswith('#'):
+            continue
+          if header and self._data is not None:
+            header = False
+            if self._check_header(line.split(self._delim)):
+              self.msg("DMData: dropping csv-header: %r" % line)
+              continue
+          self._parse_line(line)
+        continue
+
+      # no new data: check for rotation and truncation
+      try:
+        stat = os.stat(self._input)
+      except OSError:
+        stat = None                        # rotated, but not yet recreated
+      if stat and stat.st_ino != ino:
+        self.msg("DMData: %s was rotated, reopening" % self._input,True)
+        f.close()
+        f   = open(self._input,"rb",buffering=0)
+        ino = os.fstat(f.fileno()).st_ino
+      elif stat and stat.st_size < f.tell():
+        self.msg("DMData: %s was truncated, reading from start" %
+                 self._input,True)
+        f.seek(0)
+      else:
+        self._stop_event.wait(self.FOLLOW_TICK)
+        continue
+      (rest,header) = (b"",True)
+    f.close()
+    self.msg("DMData: stopped following %s" % self._input)
+
+  # --- replay records   -----------------------------------------------------
+
+  def _replay(self,records,due):
+    """ add records to the buffer when they are due """
+
+    (i,n)   = (0,records.shape[1])
+    start   = time.monotonic()
+    while i < n and not self._stop_event.is_set():
+      if due is None:
+        # next batch after the last batch is consumed
+        j = i + self.REPLAY_BATCH
+        if self.new_data:
+          self._stop_event.wait(self.REPLAY_TICK)
+          continue
+      else:
+        elapsed = time.monotonic() - start
+        j = np.searchsorted(due,elapsed,side="right")
+      if j > i:
+        self.add_records(records[:,i:j].T)
+        i = j
+      if due is not None and i < n:
+        self._stop_event.wait(max(due[i]-elapsed,self.REPLAY_TICK))
+    self.msg("DMData: replay finished")
+
+  # --- snapshot of the data for a single frame   ----------------------------
+
+  def snapshot(self):
+    """ return snapshot of the current data """
+
+    with self.lock:
+      return DMFrame(self._data,self._index_low,self._index_high,
+                     self._min_max,self.version,self._valid)
+
   # --- query min and max of a column   --------------------------------------
 
   def minmax(self,col):
     """ return minimum and maximum of a column """
 
     with self.lock:
-      return self._min_max[0:2][col].to_list()
+      return self._min_max[:,col].tolist()
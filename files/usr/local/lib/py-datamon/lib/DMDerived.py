@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMDerived: derived (computed) columns
+#
+# Values of the configuration can define an expression ("expr") instead
+# of a column, e.g. "c1*c2" or "mean(c3,50)". Expressions are compiled once
+# into functions operating on blocks (columns x samples) of data. DMData
+# evaluates the expressions for every new block and appends the results as
+# additional (virtual) columns, so they share the ring-buffer and the
+# min/max-tracking with the real columns.
+#
+# Functions with memory (mean, median, ema, diff, deriv) keep the state
+# necessary to continue with the next block, so the results do not depend
+# on the size of the blocks.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import ast, math, re, warnings
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# --- derived columns   ------------------------------------------------------
+
+class DMDerived:
+  """ compile and evaluate expressions of derived columns """
+
+  # --- constants   ----------------------------------------------------------
+
+  COLUMN = re.compile(r"c(\d+)$")
+
+  OPERATORS = {
+    ast.Add:  np.add,
+    ast.Sub:  np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div:  np.divide,
+    ast.Pow:  np.power,
+    ast.Mod:  np.mod,
+    }
+
+  FUNCTIONS = {
+    "abs":   np.abs,
+    "sqrt":  np.sqrt,
+    "exp":   np.exp,
+    "log":   np.log,
+    "log10": np.log10,
+    "sin":   np.sin,
+    "cos":   np.cos,
+    "tan":   np.tan,
+    "min":   np.minimum,
+    "max":   np.maximum,
+    }
+
+  # functions with memory and the number of constant arguments
+  WINDOW_FUNCTIONS = {
+    "mean":   1,
+    "median": 1,
+    "ema":    1,
+    "diff":   0,
+    "deriv":  0,
+    }
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,app,derived,x_col):
+    """ constructor: derived is a dict expression -> values """
+
+    self.msg     = app.msg
+    self._values = list(derived.values())
+    self._x_col  = x_col
+    self._cols   = set()
+    self._funcs  = []
+    for expr in derived:
+      self.msg("DMDerived: compiling %s" % expr)
+      try:
+        tree = ast.parse(expr,mode="eval")
+      except SyntaxError as ex:
+        raise ValueError("invalid expression %r: %s" % (expr,ex.msg))
+      self._funcs.append(self._compile(tree.body,expr))
+
+  # --- number of derived columns   ------------------------------------------
+
+  def __len__(self):
+    """ return number of derived columns """
+
+    return len(self._funcs)
+
+  # --- assign columns   -----------------------------------------------------
+
+  def assign(self,n_cols):
+    """ assign columns after the n_cols real columns to the values """
+
+    if self._cols and max(self._cols) >= n_cols:
+      raise ValueError("expression uses column %d, but data has %d columns" %
+                       (max(self._cols),n_cols))
+    for i,values in enumerate(self._values):
+      for value in values:
+        value.col = n_cols + i
+
+  # --- evaluate expressions   -----------------------------------------------
+
+  def extend(self,block):
+    """ return block (columns x samples) extended by the derived columns """
+
+    if not self._funcs:
+      return block
+    with np.errstate(all="ignore"):
+      derived = [np.broadcast_to(func(block),block.shape[1:])
+                                                     for func in self._funcs]
+    return np.vstack([block]+derived)
+
+  # --- compile expression   -------------------------------------------------
+
+  def _compile(self,node,expr):
+    """ compile node of the syntax-tree into a function of the block """
+
+    if isinstance(node,ast.Constant) and isinstance(node.value,(int,float)):
+      value = float(node.value)
+      return lambda block: value
+
+    elif isinstance(node,ast.Name):
+      if node.id == "x":
+        col = self._x_col
+      else:
+        match = self.COLUMN.match(node.id)
+        if not match:
+          raise ValueError("unknown name %r in %r" % (node.id,expr))
+        col = int(match.group(1))
+      self._cols.add(col)
+      return lambda block: block[col]
+
+    elif isinstance(node,ast.UnaryOp) and isinstance(node.op,
+                                                     (ast.USub,ast.UAdd)):
+      operand = self._compile(node.operand,expr)
+      if isinstance(node.op,ast.USub):
+        return lambda block: -operand(block)
+      return operand
+
+    elif isinstance(node,ast.BinOp) and type(node.op) in self.OPERATORS:
+      op    = self.OPERATORS[type(node.op)]
+      left  = self._compile(node.left,expr)
+      right = self._compile(node.right,expr)
+      return lambda block: op(left(block),right(block))
+
+    elif (isinstance(node,ast.Call) and isinstance(node.func,ast.Name) and
+          not node.keywords):
+      name = node.func.id
+      if name in self.FUNCTIONS:
+        func = self.FUNCTIONS[name]
+        args = [self._compile(arg,expr) for arg in node.args]
+        return lambda block: func(*[arg(block) for arg in args])
+      elif name in self.WINDOW_FUNCTIONS:
+        n_const = self.WINDOW_FUNCTIONS[name]
+        if len(node.args) != 1 + n_const or not all(
+            isinstance(arg,ast.Constant) for arg in node.args[1:]):
+          raise ValueError("%s() needs %d constant argument(s) in %r" %
+                           (name,n_const,expr))
+        arg   = self._compile(node.args[0],expr)
+        const = [arg.value for arg in node.args[1:]]
+        return getattr(self,"_"+name)(arg,*const)
+      raise ValueError("unknown function %r in %r" % (name,expr))
+
+    raise ValueError("unsupported expression %r" % expr)
+
+  # --- concatenate tail of the last block and new values   ------------------
+
+  def _window(self,arg,n):
+    """ return function creating windows of n values across blocks """
+
+    tail = np.full(n-1,np.nan)
+
+    def windows(block):
+      nonlocal tail
+      values = np.concatenate((tail,np.broadcast_to(arg(block),
+                                                    block.shape[1:])))
+      tail = values[len(values)-(n-1):]
+      return sliding_window_view(values,n)
+    return windows
+
+  # --- moving average   -----------------------------------------------------
+
+  def _mean(self,arg,n):
+    """ moving average over n samples (NaN are ignored) """
+
+    n = int(n)
+    if n < 1:
+      raise ValueError("mean() needs a window of at least one sample")
+    windows = self._window(arg,n)
+
+    def mean(block):
+      w     = windows(block)
+      valid = ~np.isnan(w)
+      return np.where(valid,w,0).sum(axis=1)/valid.sum(axis=1)
+    return mean
+
+  # --- moving median   ------------------------------------------------------
+
+  def _median(self,arg,n):
+    """ moving median over n samples (NaN are ignored) """
+
+    n = int(n)
+    if n < 1:
+      raise ValueError("median() needs a window of at least one sample")
+    windows = self._window(arg,n)
+
+    def median(block):
+      with warnings.catch_warnings():
+        warnings.simplefilter("ignore",RuntimeWarning)   # all-NaN windows
+        return np.nanmedian(windows(block),axis=1)
+    return median
+
+  # --- exponential moving average   -----------------------------------------
+
+  def _ema(self,arg,alpha):
+    """ exponential moving average with smoothing-factor alpha """
+
+    if not 0 < alpha <= 1:
+      raise ValueError("ema() needs a smoothing-factor 0 < alpha <= 1")
+    if alpha == 1:
+      return arg
+
+    # the filter is applied to the values and to the weights (1 for valid,
+    # 0 for NaN), the quotient ignores NaN and needs no start-value
+    state = np.zeros(2)
+    decay = 1 - alpha
+    chunk = max(1,int(100*math.log(10)/-math.log(decay)))   # no overflow
+
+    def ema(block):
+      nonlocal state
+      values = np.broadcast_to(arg(block),block.shape[1:])
+      valid  = ~np.isnan(values)
+      inputs = np.vstack((np.where(valid,values,0),valid))
+      result = np.empty_like(inputs)
+      for start in range(0,inputs.shape[1],chunk):
+        x      = inputs[:,start:start+chunk]
+        powers = decay**np.arange(x.shape[1])
+        y      = alpha*powers*np.cumsum(x/powers,axis=1)
+        y     += decay*powers*state[:,None]
+        result[:,start:start+chunk] = y
+        state  = y[:,-1]
+      return np.where(valid,result[0]/result[1],np.nan)
+    return ema
+
+  # --- difference to previous sample   ---------------------------------------
+
+  def _diff(self,arg):
+    """ difference to the previous sample """
+
+    windows = self._window(arg,2)
+    return lambda block: np.diff(windows(block),axis=1)[:,0]
+
+  # --- derivative   ---------------------------------------------------------
+
+  def _deriv(self,arg):
+    """ derivative with respect to the x-value """
+
+    diff_y = self._diff(arg)
+    diff_x = self._diff(lambda block: block[self._x_col])
+    return lambda block: diff_y(block)/diff_x(block)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMFrame: snapshot of the data for a single animation-frame
+#
+# DMPlot queries one snapshot per frame from DMData. Columns are contiguous
+# arrays and are created only once per frame, so all artists sharing e.g.
+# the x-column use the same array.
+#
+# Besides the data, a snapshot contains the minimum and maximum and the
+# number of valid (non-NaN) values of every column.
+#
+# A snapshot is immutable: DMData never changes data within the window of
+# a published snapshot, and the arrays returned are read-only views.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+# --- snapshot of the data   -------------------------------------------------
+
+class DMFrame:
+  """ snapshot of the data """
+
+  __slots__ = ("version","_data","_low","_high","_min_max","_valid","_cols")
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,data,low,high,min_max,version,valid=None):
+    """ constructor """
+
+    self.version  = version
+    self._data    = data
+    self._low     = low
+    self._high    = high
+    self._min_max = None if min_max is None else min_max.copy()
+    self._valid   = None if valid is None else valid.copy()
+    self._cols    = {}
+
+  # --- get column   ---------------------------------------------------------
+
+  def __getitem__(self,col):
+    """ return column (always the same array for a given column) """
+
+    try:
+      return self._cols[col]
+    except KeyError:
+      values = self._data[col,self._low:self._high]
+      values.flags.writeable = False
+      self._cols[col] = values
+      return values
+
+  # --- get block of columns   -----------------------------------------------
+
+  def block(self,cols):
+    """ return contiguous block (columns x samples) of the given columns """
+
+    if cols == list(range(cols[0],cols[0]+len(cols))):
+      # consecutive columns: no copy necessary
+      block = self._data[cols[0]:cols[0]+len(cols),self._low:self._high]
+      block.flags.writeable = False
+      return block
+    return self._data[cols,self._low:self._high]
+
+  # --- number of samples   --------------------------------------------------
+
+  def __len__(self):
+    """ return number of samples """
+
+    return self._high - self._low
+
+  # --- query min and max of a column   --------------------------------------
+
+  def minmax(self,col):
+    """ return minimum and maximum of a column (or of an array of columns) """
+
+    return self._min_max[:,col]
+
+  # --- query number of valid values   ---------------------------------------
+
+  def valid(self,col):
+    """ return number of valid values of a column (or array of columns) """
+
+    return self._valid[col]
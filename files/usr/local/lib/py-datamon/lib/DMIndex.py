@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMIndex: sparse index of the x-values of a csv-file
+#
+# The index maps x-values to byte-offsets, with one entry for about every
+# STEP bytes of the file. It is created by seeking through the file, so
+# only a single line is read and parsed for every entry. The index is
+# stored alongside the file (<file>.xidx) and recreated if the file, the
+# x-column or the step changes.
+#
+# With the index, DMData only reads the region of a huge file which covers
+# a window of x-values. This needs non-decreasing x-values, otherwise the
+# index is not valid.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import os, csv
+import numpy as np
+
+# --- sparse index of x-values   ---------------------------------------------
+
+class DMIndex:
+  """ sparse index of byte-offsets and x-values of a csv-file """
+
+  # --- constants   ----------------------------------------------------------
+
+  STEP     = 1 << 20      # bytes between two entries
+  MIN_SIZE = 1 << 26      # smaller files are always read completely
+  SUFFIX   = ".xidx"
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,app,file,delim,x_col,convert,tag=0):
+    """ constructor: convert maps a list of x-fields to an array of floats """
+
+    self.msg      = app.msg
+    self.file     = str(file)
+    self._delim   = delim
+    self._x_col   = x_col
+    self._convert = convert
+
+    stat = os.stat(self.file)
+    self.size   = stat.st_size
+    self._stamp = np.array([stat.st_size,stat.st_mtime_ns,self.STEP,
+                            x_col,tag],dtype=np.int64)
+    if not self._load():
+      self._create()
+      self._save()
+    self.valid = not (np.diff(self.xs) < 0).any()
+    self.msg("DMIndex: %d entries, valid: %r" % (len(self.xs),self.valid))
+
+  # --- load index-file   ----------------------------------------------------
+
+  def _load(self):
+    """ load index-file, return False if it is missing or outdated """
+
+    try:
+      with np.load(self.file+self.SUFFIX) as index:
+        if not np.array_equal(index["stamp"],self._stamp):
+          self.msg("DMIndex: index of %s is outdated" % self.file)
+          return False
+        self.offsets = index["offsets"]
+        self.xs      = index["xs"]
+    except (OSError,KeyError,ValueError):
+      return False
+    self.msg("DMIndex: loaded index of %s" % self.file)
+    return True
+
+  # --- create index   -------------------------------------------------------
+
+  def _create(self):
+    """ read one line every STEP bytes and convert its x-value """
+
+    self.msg("DMIndex: creating index of %s" % self.file)
+    offsets = []
+    words   = []
+    with open(self.file,"rb") as f:
+      for pos in range(self.STEP,self.size,self.STEP):
+        f.seek(pos)
+        f.readline()                       # skip partial line
+        offset = f.tell()
+        line   = f.readline().decode(errors="replace").strip()
+        if not line or line.startswith('#'):
+          continue
+        fields = next(csv.reader([line],delimiter=self._delim))
+        if len(fields) > self._x_col:
+          offsets.append(offset)
+          words.append(fields[self._x_col])
+
+    # the first entry is the start of the file (with headers and comments),
+    # lines with invalid x-values are dropped
+    xs    = self._convert(words) if words else np.empty(0)
+    valid = ~np.isnan(xs)
+    self.offsets = np.concatenate(([0],np.array(offsets,dtype=np.int64)[valid]))
+    self.xs      = np.concatenate(([-np.inf],xs[valid]))
+
+  # --- save index-file   ----------------------------------------------------
+
+  def _save(self):
+    """ save index alongside the file (if possible) """
+
+    try:
+      with open(self.file+self.SUFFIX,"wb") as f:
+        np.savez(f,stamp=self._stamp,offsets=self.offsets,xs=self.xs)
+    except OSError as ex:
+      self.msg("DMIndex: could not save index: %s" % ex)
+
+  # --- lookup window   ------------------------------------------------------
+
+  def lookup(self,xmin,xmax):
+    """ return byte-range (start,end) and x-range (lo,hi) of a window """
+
+    # the bytes start..end contain all lines with xmin <= x <= xmax and
+    # all lines with lo <= x < hi
+    i = max(0,np.searchsorted(self.xs,xmin,side="left")-1)
+    j = np.searchsorted(self.xs,xmax,side="right")
+    if j < len(self.xs):
+      return (int(self.offsets[i]),int(self.offsets[j]),self.xs[i],self.xs[j])
+    return (int(self.offsets[i]),self.size,self.xs[i],np.inf)
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMPlan: per-frame plan compiled from the configuration
+#
+# The plan is created once after the figure is created. It flattens the
+# configuration into a list of subplots with the axes, the parsed rescale-
+# policies and the renderer. The columns of all x- and y-values are
+# collected into a single array of unique columns, so the minimum and
+# maximum of all columns are queried with one vectorized call per frame.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import types
+import numpy as np
+
+# --- per-frame plan   -------------------------------------------------------
+
+class DMPlan:
+  """ plan of all subplots for the update of a frame """
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,config,axes,renderers):
+    """ constructor """
+
+    cols = []
+
+    def add_col(col):
+      cols.append(col)
+      return len(cols)-1
+
+    self.subplots = []
+    for plot_cfg,ax,renderer in zip(config.plots,axes,renderers):
+      subplot = types.SimpleNamespace(
+        ax       = ax,
+        x_col    = plot_cfg.x.col,
+        x_index  = add_col(plot_cfg.x.col),
+        is_date  = plot_cfg.x.type in ["date","datetime"],
+        rescale  = plot_cfg.xaxis.rescale,
+        renderer = renderer,
+        values   = [])
+
+      # one entry per value: (axis,index,rescale-min,rescale-max),
+      # rescaling is None for configured limits
+      for value in plot_cfg.values:
+        if value.axis == 1:
+          (target,cfg_yaxis) = (ax,plot_cfg.yaxis)
+        else:
+          (target,cfg_yaxis) = (ax.yaxis2,plot_cfg.yaxis2)
+        subplot.values.append((target,add_col(value.col),
+                               None if cfg_yaxis.min else cfg_yaxis.rescale.min,
+                               None if cfg_yaxis.max else cfg_yaxis.rescale.max))
+      self.subplots.append(subplot)
+
+    # query every column only once
+    (self._cols,index) = np.unique(cols,return_inverse=True)
+    index = index.tolist()
+    for subplot in self.subplots:
+      subplot.x_index = index[subplot.x_index]
+      subplot.values  = [(target,index[i],r_min,r_max)
+                                 for (target,i,r_min,r_max) in subplot.values]
+
+  # --- minimum and maximum of all columns   ---------------------------------
+
+  def minmax(self,frame):
+    """ return lists of minimum and maximum of all columns """
+
+    min_max = frame.minmax(self._cols)
+    return (min_max[0].tolist(),min_max[1].tolist())
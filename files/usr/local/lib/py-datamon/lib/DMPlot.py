@@ -13,70 +13,100 @@ import datetime, time, traceback
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import matplotlib.dates as mdates
+from dateutil import tz
+
+from lib import DMTimeFormatter, DMPlan
+from lib import DMRendererLines, DMRendererCollection, DMRendererRaster
 
 # --- class DMPLot   ---------------------------------------------------------
 
 class DMPlot:
   """ plot data using matplotlib """
 
+  # unix-epoch in matplotlib-dates (days)
+  EPOCH_DAYS = mdates.date2num(
+    datetime.datetime(1970,1,1,tzinfo=datetime.timezone.utc))
+
+  # renderers for the values of a subplot
+  RENDERERS = {
+    "lines":      DMRendererLines,
+    "collection": DMRendererCollection,
+    "raster":     DMRendererRaster,
+    }
+
+  # options for the subplots, all other options are for the figure
+  SUBPLOT_OPTIONS = ("sharex","sharey","width_ratios","height_ratios",
+                     "subplot_kw","gridspec_kw")
 
   # --- constructor   --------------------------------------------------------
 
-  def __init__(self,app,config,data=None,stop_event=None):
-    """ constructor """
+  def __init__(self,app,config,data=None,stop_event=None,index=0):
+    """ constructor (index: number of the figure if data is shared) """
 
     self.msg         = app.msg
     self.debug       = app.debug
-    self._img_file   = app.output
+    self._img_file   = self._get_img_file(app.output,index)
     self._freq       = app.freq
+    self._stats      = app.stats
+    self._show_stats = app.show_stats
+    self._profiler   = app.profiler
+    self._primary    = index == 0           # only first figure counts frames
     self._config     = config
     self._data       = data
     self._stop_event = stop_event
+    self._version    = 0                    # no frame before the first update
+    self._failed     = False
+    self._segment    = 0
+    self._ani        = None
+
+  # --- name of image-file   -------------------------------------------------
+
+  def _get_img_file(self,img_file,index):
+    """ return name of image-file, add index for additional figures """
+
+    if not img_file or not index:
+      return img_file
+    (base,dot,ext) = img_file.rpartition(".")
+    if not dot:
+      return "%s-%d" % (img_file,index)
+    return "%s-%d.%s" % (base,index,ext)
 
   # --- calculate new xmin for plot   ----------------------------------------
 
-  def _new_xmin(self,cfg,xmin,current):
+  def _new_xmin(self,rescale,xmin,current):
     """ get new minimum for x-axis """
 
-    if cfg.min == "off":
+    (mode,value) = rescale
+    if mode == "off":
       # keep configured minimum
       return xmin
-    elif cfg.min == "auto":
-      return current
-    elif cfg.min[0] == "*":
+    elif mode == "*":
       # to slow down flickering, we move the minimum only if
       # current > fac*xmin
-      if current > float(cfg.min[1:])*xmin:
-        return current
-      else:
-        return xmin
-    elif cfg.min[0] == "+":
-      if current > xmin+float(cfg.min[1:]):
-        return current
-      else:
-        return xmin
+      return current if current > value*xmin else xmin
+    elif mode == "+":
+      return current if current > xmin+value else xmin
     else:
-      # unsupported
+      # auto
       return current
 
   # --- calculate new xmax for plot   ----------------------------------------
 
-  def _new_xmax(self,cfg,xmin,xmax,current):
+  def _new_xmax(self,rescale,xmin,xmax,current):
     """ get new maximum for x-axis """
 
-    if cfg.max == "off":
+    (mode,value) = rescale
+    if mode == "off":
       # keep configured maximum
       return xmax
-    elif cfg.max == "auto":
-      return current
-    elif cfg.max[0] == "*":
+    elif mode == "*":
       # we expect a factor > 1: increase by factor
-      return max(10,current,xmin+(xmax-xmin)*float(cfg.max[1:]))
-    elif cfg.max[0] == "+":
+      return max(10,current,xmin+(xmax-xmin)*value)
+    elif mode == "+":
       # linear increase
-      return max(current,xmax+float(cfg.max[1:]))
+      return max(current,xmax+value)
     else:
-      # unsupported
+      # auto
       return current
 
   # --- calculate new y-limits for plot   ------------------------------------
@@ -84,235 +114,449 @@ class DMPlot:
   def _new_ylim(self,rescale,ymin,ymax,current):
     """ get new limits for y-axis """
 
-    if rescale == "auto":
+    (mode,value) = rescale
+    if mode == "auto":
       return current
 
-    if current < ymin:
-      lower = True
-    else:
-      lower = False
-
-    if rescale == "off":
+    lower = current < ymin
+    if mode == "off":
       # keep configured limit
       return ymin if lower else ymax
-    elif rescale[0] == "*":
+    elif mode == "*":
       # we expect a factor >1: increase interval by factor
       interval = ymax-ymin
       if lower:
-        return min(current,ymax-float(rescale[1:])*interval)
+        return min(current,ymax-value*interval)
       else:
-        return max(current,ymin+float(rescale[1:])*interval)
-    elif rescale[0] == "+":
+        return max(current,ymin+value*interval)
+    else:
       if lower:
-        return min(current,ymin-float(rescale[1:]))
+        return min(current,ymin-value)
       else:
-        return max(current,ymax+float(rescale[1:]))
-    else:
-      # unsupported
-      return current
+        return max(current,ymax+value)
 
   # --- update the plot   ----------------------------------------------------
 
   def _update_plot(self,have_new):
     """ update-function for animation """
 
+    if self._stats:
+      start = time.perf_counter()
+
     if have_new:
       try:
         redraw = False
-        i_line = 0
-        i_ax   = 0
-        for plot_cfg in self._config.plots:
-          (xmin,xmax) = self._axs[i_ax].get_xlim()
-          (tmin,tmax) = self._data.minmax(plot_cfg.x.col)
+        frame  = self._data.snapshot()
+        self._version = frame.version
+        restart = self._segment != self._data.segment
+        self._segment = self._data.segment
+        (lows,highs) = self._plan.minmax(frame)
+        for subplot in self._plan.subplots:
+          ax          = subplot.ax
+          (xmin,xmax) = ax.get_xlim()
+          tmin        = lows[subplot.x_index]
+          tmax        = highs[subplot.x_index]
+
+          # rescaling is relative to the first x-value for dates
+          if subplot.is_date:
+            x0 = self._data.x_origin
+            (xmin,xmax,tmin,tmax) = (xmin-x0,xmax-x0,tmin-x0,tmax-x0)
+          else:
+            x0 = 0
+
+          # new segment (reset of the x-values): restart the x-axis with
+          # the same width
+          if restart and tmin < xmin:
+            (xmin,xmax) = (tmin,tmin+xmax-xmin)
+            ax.set_xlim(left=xmin+x0,right=xmax+x0)
+            redraw = True
 
           # handle x-axis scrolling/rescaling
           if tmin > xmin:
-            new_min = self._new_xmin(plot_cfg.xaxis.rescale,xmin,tmin)
+            new_min = self._new_xmin(subplot.rescale.min,xmin,tmin)
             if new_min > xmin:
               if xmax-tmax < new_min-xmin or xmax < new_min:
                 # shift xmax by the same amount
                 xmax = xmax + new_min-xmin
               xmin = new_min
-              self._axs[i_ax].set_xlim(left=xmin,right=xmax)
+              ax.set_xlim(left=xmin+x0,right=xmax+x0)
               redraw = True
           if tmax > xmax:
-            new_max = self._new_xmax(plot_cfg.xaxis.rescale,xmin,xmax,tmax)
+            new_max = self._new_xmax(subplot.rescale.max,xmin,xmax,tmax)
             if new_max > xmax:
-              self._axs[i_ax].set_xlim(right=new_max)
+              ax.set_xlim(right=new_max+x0)
               redraw = True
 
-          for value in plot_cfg.values:
-            # check if a redraw is necessary
-            (vmin,vmax) = self._data.minmax(value.col)
-            if value.axis == 1:
-              cfg_yaxis = plot_cfg.yaxis
-              axs       = self._axs[i_ax]
-            else:
-              cfg_yaxis = plot_cfg.yaxis2
-              axs       = self._axs[i_ax].yaxis2
-
+          # handle y-axis rescaling (rescale is None for fixed limits)
+          for (axs,index,rescale_min,rescale_max) in subplot.values:
             (ymin,ymax) = axs.get_ylim()
-            if not cfg_yaxis.min and vmin < ymin:
-              new_min = self._new_ylim(cfg_yaxis.rescale.min,ymin,ymax,vmin)
-              axs.set_ylim(bottom=new_min)
+            vmin = lows[index]
+            vmax = highs[index]
+            if rescale_min and vmin < ymin:
+              axs.set_ylim(bottom=self._new_ylim(rescale_min,ymin,ymax,vmin))
               redraw = True
-            if not cfg_yaxis.max and vmax > ymax:
-              new_max = self._new_ylim(cfg_yaxis.rescale.max,ymin,ymax,vmax)
-              axs.set_ylim(top=new_max)
+            if rescale_max and vmax > ymax:
+              axs.set_ylim(top=self._new_ylim(rescale_max,ymin,ymax,vmax))
               redraw = True
-            # update values
-            self._lines[i_line].set_data(self._data[plot_cfg.x.col], # synchronized in
-                                         self._data[value.col])           # DMData
-            i_line += 1
-          i_ax += 1
+
+          # update values
+          subplot.renderer.update(frame,frame[subplot.x_col])
         if redraw:
           self._axs[0].figure.canvas.draw()
-      except:
+      except Exception as ex:
+        # report the first error, the animation continues
+        if not self._failed:
+          self.msg("DMPlot: update of plot failed: %s" % ex,force=True)
+          self._failed = True
         if self.debug:
           traceback.print_exc()
 
-    # always return the line-artists, or else the animation fails
-    return self._lines
+    if self._stats:
+      self._stats.observe("update_plot",time.perf_counter()-start)
+      if self._primary:
+        self._stats.frame()
+      if self._overlay:
+        self._overlay.set_text(self._stats.overlay())
+    if self._profiler and self._primary:
+      self._profiler.frame()
+
+    # always return the artists, or else the animation fails
+    return self._artists
+
+  # --- wrap function with timer   -------------------------------------------
+
+  def _timed(self,name,func):
+    """ return function which adds the execution-time to the statistics """
+
+    def wrapper(*args,**kwargs):
+      start  = time.perf_counter()
+      result = func(*args,**kwargs)
+      self._stats.observe(name,time.perf_counter()-start)
+      return result
+    return wrapper
 
   # --- update the data   ----------------------------------------------------
 
   def _update_data(self):
     """ frames-function for animation """
 
+    # the data is shared by all figures and updated once per tick by the
+    # timer (see create()), the figures only check the version of the data
     while True:
-      have_new = self._data.update() > 0
-      yield have_new
+      yield self._data.version != self._version
 
-  # --- format x as time/date/datetime   -------------------------------------
+  # --- update shared data   -------------------------------------------------
 
-  def _fmt_time(self,x,x_config):
-    """ format x-value as [hh:]mm:ss.mmm """
+  def _update_shared(self):
+    """ timer-callback: update the data shared by all figures """
 
-    if x_config.type in ["date","datetime"]:
-      val = datetime.datetime.fromtimestamp(x)
-      return val.strftime(x_config.format)
+    # note: the timer removes callbacks which return 0
+    self._data.update()
 
-    x,frac = divmod(x,1)
-    m, s = divmod(int(x),60)
-    h, m = divmod(m,60)
+  # --- convert configured limit of the x-axis   ----------------------------
 
-    frac = int(1000*frac)
-    frac = "" if frac == 0 else ".{0:03d}".format(frac)
-    frac = frac.rstrip("0")
+  def _x_limit(self,x_config,limit):
+    """ convert limit of x-axis to the internal representation """
 
-    if h > 0:
-      return "{0:02d}:{1:02d}:{2:02d}{3:s}".format(h,m,s,frac)
+    if x_config.type not in ["date","datetime"]:
+      return limit
+    limit = datetime.datetime.strptime(limit,"%Y-%m-%dT%H:%M:%S")
+    if self._config.is_live:
+      return limit.timestamp()
     else:
-      return "{0:02d}:{1:02d}{2:s}".format(m,s,frac)
+      return mdates.date2num(limit.astimezone())
 
-  # --- plot the data   ------------------------------------------------------
+  # --- x-values for plotting   ----------------------------------------------
 
-  def plot(self):
-    """ plot the data """
+  def _x_values(self,frame,x_config):
+    """ return x-values, converted to matplotlib-dates for static plots """
+
+    x = frame[x_config.col]
+    if x_config.type in ["date","datetime"] and not self._config.is_live:
+      # unix-timestamps to days
+      return x/86400 + self.EPOCH_DAYS
+    return x
+
+  # --- convert x-value of an axis   ----------------------------------------
+
+  def _x_raw(self,value):
+    """ convert x-value of a static plot to the unscaled x-value """
+
+    x_config = self._config.x
+    if x_config.type in ["date","datetime"]:
+      value = (value - self.EPOCH_DAYS)*86400
+    return value/x_config.scale
+
+  # --- load data for a new x-range   ---------------------------------------
+
+  def _on_xlim(self,ax):
+    """ load the window of the data for the visible x-range (panning) """
+
+    (xmin,xmax) = map(self._x_raw,ax.get_xlim())
+    (lo,hi)     = self._data.window
+    if lo <= xmin and xmax <= hi:
+      return
+
+    # load the visible range and the same width on both sides
+    width = xmax - xmin
+    try:
+      self._data.load_window(xmin-width,xmax+width)
+    except Exception as ex:
+      self.msg("DMPlot: loading data failed: %s" % ex,force=True)
+      return
+    frame = self._data.snapshot()
+    for plot_cfg,renderer in zip(self._config.plots,self._renderers):
+      renderer.update(frame,self._x_values(frame,plot_cfg.x))
+    ax.figure.canvas.draw_idle()
+
+  # --- create renderer for a subplot   -------------------------------------
+
+  def _get_renderer(self,plot_cfg):
+    """ create renderer for the values of a subplot """
+
+    if plot_cfg.render not in self.RENDERERS:
+      self.msg("DMPlot: unsupported renderer %s, using lines" %
+               plot_cfg.render,force=True)
+      return DMRendererLines(plot_cfg)
+    return self.RENDERERS[plot_cfg.render](plot_cfg)
+
+  # --- create figure   ------------------------------------------------------
+
+  def _create_figure(self):
+    """ create figure with all subplots and artists """
+
+    # options of the figure, the rest is for the subplots
+    options = dict(self._config.options)
+    sub_kw  = {key: options.pop(key) for key in self.SUBPLOT_OPTIONS
+                                                         if key in options}
+    self._fig = plt.figure(**options)
+    self._create_subplots(sub_kw)
+    return self._fig
+
+  # --- create subplots   ----------------------------------------------------
+
+  def _create_subplots(self,sub_kw):
+    """ create all subplots and artists of the figure """
+
+    # wait until data is available
+    if self._config.is_live:
+      while not self._data.new_data and not self._data.version:
+        time.sleep(self._freq/1000)
+
+    # keep renderers and axes (needed for live-monitoring)
+    self._fig.suptitle(self._config.title,**self._config.title_opts)
+    (self._axs,self._renderers) = self._new_subplots(self._config,sub_kw)
+    self._overlay = None
+    self._compile()
+
+  # --- create grid of subplots   --------------------------------------------
+
+  def _new_subplots(self,config,sub_kw):
+    """ create grid of subplots, return lists of axes and renderers """
 
     # define grid of plots
-    fig, axs = plt.subplots(nrows=self._config.rows, ncols=self._config.cols,
-                            squeeze=False,**self._config.options)
-    fig.suptitle(self._config.title,**self._config.title_opts)
+    axs = self._fig.subplots(nrows=config.rows, ncols=config.cols,
+                             squeeze=False,**sub_kw)
 
     # create list of subplot-coordinates
-    pos = [[r,c] for r in range(self._config.rows)
-                                            for c in range(self._config.cols)]
-
-    # keep list of artists (needed for live-monitoring)
-    self._lines = []
-    self._axs   = []
+    pos = [[r,c] for r in range(config.rows) for c in range(config.cols)]
 
     # for every subplot...
-    for [r,c],plot_cfg in zip(pos,self._config.plots):
-      self._axs.append(axs[r][c])
+    (axes,renderers) = ([],[])
+    for [r,c],plot_cfg in zip(pos,config.plots):
       self.msg("DMPLot: plotting subplot[%d][%d]" % (r,c))
+      axes.append(axs[r][c])
+      renderers.append(self._create_subplot(axs[r][c],plot_cfg))
+    return (axes,renderers)
+
+  # --- create a single subplot   --------------------------------------------
+
+  def _create_subplot(self,ax,plot_cfg):
+    """ configure axes of a subplot and create its artists """
+
+    # ... configure axis
+    if plot_cfg.x.type == "time" or (
+      plot_cfg.x.type in ["date","datetime"] and self._config.is_live):
+      ax.xaxis.set_major_formatter(DMTimeFormatter(plot_cfg.x))
+      ax.tick_params(axis='x',labelrotation=45)
+    elif plot_cfg.x.type in ["date","datetime"]:
+      locator = mdates.AutoDateLocator(tz=tz.tzlocal())
+      formatter = mdates.ConciseDateFormatter(locator,tz=tz.tzlocal())
+      ax.xaxis.set_major_locator(locator)
+      ax.xaxis.set_major_formatter(formatter)
+    if plot_cfg.xaxis.min:
+      ax.set_xlim(left=self._x_limit(plot_cfg.x,plot_cfg.xaxis.min))
+    if plot_cfg.xaxis.max:
+      ax.set_xlim(right=self._x_limit(plot_cfg.x,plot_cfg.xaxis.max))
+    if plot_cfg.yaxis.min:
+      ax.set_ylim(bottom=plot_cfg.yaxis.min)
+    if plot_cfg.yaxis.max:
+      ax.set_ylim(top=plot_cfg.yaxis.max)
+
+    # ... and plot title and axis-labels
+    ax.set_title(plot_cfg.title,**plot_cfg.title_opts)
+    ax.set_xlabel(plot_cfg.xaxis.text,**plot_cfg.xaxis.text_opts)
+    ax.set_ylabel(plot_cfg.yaxis.text,**plot_cfg.yaxis.text_opts)
+
+    # second y-axis
+    yaxis2 = None
+    if plot_cfg.yaxis2:
+      yaxis2 = ax.twinx()
+      ax.yaxis2 = yaxis2                    # keep reference for live plots
+      if plot_cfg.yaxis2.min:
+        yaxis2.set_ylim(bottom=plot_cfg.yaxis2.min)
+      if plot_cfg.yaxis2.max:
+        yaxis2.set_ylim(top=plot_cfg.yaxis2.max)
+      yaxis2.set_ylabel(plot_cfg.yaxis2.text,**plot_cfg.yaxis2.text_opts)
+
+    # ... and plot grid
+    ax.grid(visible=plot_cfg.grid,**plot_cfg.grid_opts)
+
+    # ... plot 1..n y-values
+    renderer = self._get_renderer(plot_cfg)
+    frame    = self._data.snapshot()
+    targets  = [ax,yaxis2]
+    renderer.create(targets,frame,self._x_values(frame,plot_cfg.x))
+
+    # ... plot legend
+    if plot_cfg.legend["loc"]:
+      renderer.legend(targets,plot_cfg.legend)
+    return renderer
+
+  # --- compile plan and collect artists   -----------------------------------
+
+  def _compile(self):
+    """ compile plan for the update of the frames, collect artists """
+
+    self._plan = DMPlan(self._config,self._axs,self._renderers)
+
+    # keep list of all animated artists
+    self._artists = []
+    for renderer in self._renderers:
+      self._artists.extend(renderer.artists)
+    if self._show_stats:
+      if not self._overlay:
+        self._overlay = self._fig.text(0.005,0.005,"",fontsize="x-small",
+                                       family="monospace")
+      self._artists.append(self._overlay)
+
+  # --- reload configuration   -----------------------------------------------
+
+  def reload(self,config):
+    """ rebuild the figure for a new configuration, keep unchanged subplots """
+
+    # the new subplots are created on new axes, the old axes are only
+    # removed if everything succeeded
+    fig      = self._fig
+    old_axes = list(fig.axes)
+    state    = (self._config,self._axs,self._renderers)
+    old      = self._config
+    try:
+      if (config.rows,config.cols,config.options,len(config.plots)) != (
+          old.rows,old.cols,old.options,len(old.plots)):
+        # new layout: recreate all subplots (the size of the window is kept)
+        self.msg("DMPlot: layout changed, recreating all subplots")
+        options = config.options
+        (axs,renderers) = self._new_subplots(config,
+                            {key: options[key] for key in
+                             self.SUBPLOT_OPTIONS if key in options})
+        replaced = old_axes
+      else:
+        # only recreate changed subplots (at the same position)
+        (axs,renderers,replaced) = (list(self._axs),list(self._renderers),[])
+        for n,(plot_cfg,ax) in enumerate(zip(config.plots,self._axs)):
+          if plot_cfg == old.plots[n]:
+            continue
+          self.msg("DMPlot: recreating subplot %d" % n)
+          axs[n] = fig.add_subplot(ax.get_subplotspec(),
+                                   sharex=self._shared(ax,"x"),
+                                   sharey=self._shared(ax,"y"))
+          renderers[n] = self._create_subplot(axs[n],plot_cfg)
+          replaced.append(ax)
+          if hasattr(ax,"yaxis2"):
+            replaced.append(ax.yaxis2)
+      (self._config,self._axs,self._renderers) = (config,axs,renderers)
+      self._compile()
+    except Exception:
+      # keep the old state
+      for ax in fig.axes:
+        if ax not in old_axes:
+          ax.remove()
+      (self._config,self._axs,self._renderers) = state
+      self._compile()
+      raise
+
+    for ax in replaced:
+      ax.remove()
+    fig.suptitle(config.title,**config.title_opts)
+
+    # the new artists are animated and not part of the background, which
+    # is cached by the animation for the next frame after a full redraw
+    if self._ani:
+      for artist in self._artists:
+        artist.set_animated(True)
+    fig.canvas.draw()
+
+  # --- find subplot sharing an axis   ---------------------------------------
+
+  def _shared(self,ax,axis):
+    """ return another subplot which shares the x- or y-axis with ax """
+
+    if axis == "x":
+      siblings = ax.get_shared_x_axes().get_siblings(ax)
+    else:
+      siblings = ax.get_shared_y_axes().get_siblings(ax)
+    return next((other for other in self._axs
+                            if other is not ax and other in siblings),None)
+
+  # --- create figure and animation   ---------------------------------------
+
+  def create(self,event_source=None):
+    """ create figure and save it or animate it, return event-source """
+
+    fig = self._create_figure()
 
-      # ... configure axis
-      if plot_cfg.x.type == "time" or (
-        plot_cfg.x.type in ["date","datetime"] and self._config.is_live):
-        axs[r][c].xaxis.set_major_formatter(
-                           lambda x, pos: self._fmt_time(x,plot_cfg.x))
-        axs[r][c].tick_params(axis='x',labelrotation=45)
-      elif plot_cfg.x.type == "date":
-        locator = mdates.AutoDateLocator()
-        formatter = mdates.ConciseDateFormatter(locator)
-        axs[r][c].xaxis.set_major_locator(locator)
-        axs[r][c].xaxis.set_major_formatter(formatter)
-      if plot_cfg.xaxis.min:
-        if plot_cfg.x.type in ["date","datetime"]:
-          axs[r][c].set_xlim(
-            left=datetime.datetime.strptime(plot_cfg.xaxis.min,"%Y-%m-%dT%H:%M:%S"))
-        else:
-          axs[r][c].set_xlim(left=plot_cfg.xaxis.min)
-      if plot_cfg.xaxis.max:
-        if plot_cfg.x.type in ["date","datetime"]:
-          axs[r][c].set_xlim(
-            right=datetime.datetime.strptime(plot_cfg.xaxis.max,"%Y-%m-%dT%H:%M:%S"))
-        else:
-          axs[r][c].set_xlim(right=plot_cfg.xaxis.max)
-      if plot_cfg.yaxis.min:
-        axs[r][c].set_ylim(bottom=plot_cfg.yaxis.min)
-      if plot_cfg.yaxis.max:
-        axs[r][c].set_ylim(top=plot_cfg.yaxis.max)
-
-      # ... and plot title and axis-labels
-      axs[r][c].set_title(plot_cfg.title,**plot_cfg.title_opts)
-      axs[r][c].set_xlabel(plot_cfg.xaxis.text,**plot_cfg.xaxis.text_opts)
-      axs[r][c].set_ylabel(plot_cfg.yaxis.text,**plot_cfg.yaxis.text_opts)
-
-      # second y-axis
-
-      if plot_cfg.yaxis2:
-        yaxis2 = axs[r][c].twinx()
-        axs[r][c].yaxis2 = yaxis2              # keep reference for live plots
-        if plot_cfg.yaxis2.min:
-          yaxis2.set_ylim(bottom=plot_cfg.yaxis2.min)
-        if plot_cfg.yaxis2.max:
-          yaxis2.set_ylim(top=plot_cfg.yaxis2.max)
-        yaxis2.set_ylabel(plot_cfg.yaxis2.text,**plot_cfg.yaxis2.text_opts)
-
-      # ... and plot grid
-      axs[r][c].grid(visible=plot_cfg.grid,**plot_cfg.grid_opts)
-
-      # wait until data is available
-      if self._config.is_live:
-        while not self._data.new_data:
-          time.sleep(self._freq/1000)
-
-      # ... plot 1..n y-values
-      for value in plot_cfg.values:
-        if value.axis == 1:
-          line = axs[r][c].plot(self._data[plot_cfg.x.col],
-                                self._data[value.col],
-                                label = value.label,
-                                **value.options)
-        else:
-          line = yaxis2.plot(self._data[plot_cfg.x.col],
-                          self._data[value.col],
-                          label = value.label,
-                          **value.options)
-        self._lines.append(line[0])
-
-      # ... plot legend
-      if plot_cfg.legend["loc"]:
-        axs[r][c].legend(**plot_cfg.legend)
-        if plot_cfg.yaxis2:
-          yaxis2.legend(**plot_cfg.legend)
-
-    # show plot
     if self._img_file:
-      plt.savefig(self._img_file)
+      fig.savefig(self._img_file)
       self.msg("DMPlot: %s created" % self._img_file,force=True)
     elif self._config.is_live:
-      ani = animation.FuncAnimation(fig,
-                                    self._update_plot,
-                                    self._update_data,
-                                    interval=self._freq,
-                                    repeat=False,
-                                    cache_frame_data=False,
-                                    blit=True)
-      plt.show()
-    else:
-      plt.show()
+      # all figures sharing the data share the timer of the first figure
+      if not event_source:
+        event_source = fig.canvas.new_timer(interval=self._freq)
+        # added before the callbacks of the animations,
+        # so the data is updated before the figures of a tick
+        event_source.add_callback(self._update_shared)
+      self._ani = animation.FuncAnimation(fig,
+                                          self._update_plot,
+                                          self._update_data,
+                                          event_source=event_source,
+                                          repeat=False,
+                                          cache_frame_data=False,
+                                          blit=True)
+      if self._stats:
+        # blitting of the artists happens after _update_plot()
+        self._ani._post_draw = self._timed("draw",self._ani._post_draw)
+    elif self._data.index:
+      # window of a huge csv-file: load other windows when panning
+      for ax in self._axs:
+        ax.callbacks.connect("xlim_changed",self._on_xlim)
+    return event_source
+
+  # --- show all figures   ---------------------------------------------------
+
+  def show(self):
+    """ show all figures (blocks until all figures are closed) """
+
+    if self._img_file:
+      return
+    plt.show()
+    if not self._config.is_live:
       plt.pause(1)
+
+  # --- plot the data   ------------------------------------------------------
+
+  def plot(self):
+    """ plot the data """
+
+    self.create()
+    self.show()
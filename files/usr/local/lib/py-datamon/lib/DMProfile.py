@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMProfile: sampling profiler for the reader thread and the animation
+#
+# A background thread samples the stacks of all other threads (i.e. the
+# reader thread and the main thread running the FuncAnimation callbacks).
+# After the configured number of frames, the samples are written either
+# as a pstats-file (readable with python -m pstats, snakeviz, ...) or as
+# folded stacks (input for flamegraph.pl, speedscope, ...) if the filename
+# ends with ".folded" or ".txt".
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import sys, time, threading, collections, marshal
+
+# --- sampling profiler   ----------------------------------------------------
+
+class DMProfile:
+  """ sampling profiler """
+
+  # --- constants   ----------------------------------------------------------
+
+  INTERVAL = 0.001             # sampling interval (seconds)
+  FOLDED   = (".folded",".txt")
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,app):
+    """ constructor """
+
+    self.msg         = app.msg
+    self._file       = app.profile
+    self._max_frames = app.profile_frames
+    self._frames     = 0
+    self._rounds     = 0
+    self._elapsed    = 0
+    self._samples    = collections.Counter()
+    self._stop_event = threading.Event()
+    self._thread     = None
+
+  # --- start sampling   -----------------------------------------------------
+
+  def start(self):
+    """ start sampler thread """
+
+    self.msg("DMProfile: profiling %d frames" % self._max_frames)
+    self._thread = threading.Thread(target=self._sample,daemon=True)
+    self._thread.start()
+
+  # --- sample stacks of all threads   ---------------------------------------
+
+  def _sample(self):
+    """ sample stacks of all threads except the sampler """
+
+    own   = threading.get_ident()
+    names = {}
+    start = time.perf_counter()
+    while not self._stop_event.wait(self.INTERVAL):
+      for ident,frame in sys._current_frames().items():
+        if ident == own:
+          continue
+        if ident not in names:
+          names = {t.ident: t.name for t in threading.enumerate()}
+        stack = []
+        while frame:
+          code = frame.f_code
+          stack.append((code.co_filename,code.co_firstlineno,code.co_name))
+          frame = frame.f_back
+        stack.append(("~",0,names.get(ident,"thread")))
+        stack.reverse()
+        self._samples[tuple(stack)] += 1
+      self._rounds += 1
+    self._elapsed = time.perf_counter() - start
+
+  # --- count frames   -------------------------------------------------------
+
+  def frame(self):
+    """ count frame, finish profiling after the configured frames """
+
+    self._frames += 1
+    if self._frames == self._max_frames:
+      self.finish()
+
+  # --- stop sampling and write result   -------------------------------------
+
+  def finish(self):
+    """ stop sampler and write profile """
+
+    if not self._thread or self._stop_event.is_set():
+      return
+    self._stop_event.set()
+    self._thread.join()
+
+    if self._file.endswith(self.FOLDED):
+      self._write_folded()
+    else:
+      self._write_pstats()
+    self.msg("DMProfile: %d frames, %d samples, profile written to %s" %
+             (self._frames,sum(self._samples.values()),self._file),force=True)
+
+  # --- write folded stacks   ------------------------------------------------
+
+  def _write_folded(self):
+    """ write samples as folded stacks """
+
+    with open(self._file,"w") as f:
+      for stack,n in self._samples.items():
+        names = ["%s (%s:%d)" % (func,file,line) if line else func
+                                                for file,line,func in stack]
+        f.write("%s %d\n" % (";".join(names),n))
+
+  # --- write pstats-file   --------------------------------------------------
+
+  def _write_pstats(self):
+    """ write samples in the format of pstats (calls are samples) """
+
+    dt    = self._elapsed/max(1,self._rounds)
+    stats = {}
+    for stack,n in self._samples.items():
+      stack = stack[1:]                       # drop thread-name
+      seen  = set()
+      for i,func in enumerate(stack):
+        entry = stats.setdefault(func,[0,0,0.0,0.0,{}])
+        if i == len(stack)-1:
+          entry[2] += n*dt                    # own time
+        if func in seen:
+          continue                            # count recursion only once
+        seen.add(func)
+        entry[0] += n
+        entry[1] += n
+        entry[3] += n*dt                      # cumulative time
+        if i > 0:
+          caller = entry[4].setdefault(stack[i-1],[0,0,0.0,0.0])
+          caller[0] += n
+          caller[1] += n
+          caller[3] += n*dt
+          if i == len(stack)-1:
+            caller[2] += n*dt
+
+    stats = {func: (cc,nc,tt,ct,{k: tuple(v) for k,v in callers.items()})
+                              for func,(cc,nc,tt,ct,callers) in stats.items()}
+    with open(self._file,"wb") as f:
+      marshal.dump(stats,f)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMRenderer: base-class of the renderers of a subplot
+#
+# DMPlot creates the figure, the axes and handles the limits of the axes.
+# Drawing the values of a subplot is delegated to a renderer, which is
+# selected with the "render"-attribute of the configuration:
+#
+#   lines:      one Line2D per value (default)
+#   collection: one LineCollection per axis
+#   raster:     decimated values drawn into one image per axis
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import abc
+import matplotlib.pyplot as plt
+from matplotlib.lines import Line2D
+
+# --- base-class of renderers   ----------------------------------------------
+
+class DMRenderer(abc.ABC):
+  """ base-class of renderers """
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,plot_cfg):
+    """ constructor """
+
+    self._plot_cfg = plot_cfg
+    self.artists   = []               # animated artists
+    self.handles   = [None,None]      # legend-handles per axis (None: auto)
+
+  # --- values of an axis   --------------------------------------------------
+
+  def _values(self,i):
+    """ return values plotted on axis i (0: yaxis, 1: yaxis2) """
+
+    return [v for v in self._plot_cfg.values if v.axis == i+1]
+
+  # --- legend-handles for values   ------------------------------------------
+
+  def _proxies(self,values):
+    """ create proxy-artists for the legend (color, linewidth, linestyle) """
+
+    colors  = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    handles = []
+    for n,v in enumerate(values):
+      handles.append(Line2D([],[],label=v.label,**{
+        "color":     v.options.get("color",colors[n % len(colors)]),
+        "linewidth": v.options.get("linewidth",
+                                   plt.rcParams["lines.linewidth"]),
+        "linestyle": v.options.get("linestyle","solid")}))
+    return handles
+
+  # --- create artists   -----------------------------------------------------
+
+  @abc.abstractmethod
+  def create(self,targets,frame,x_data):
+    """ create artists on the targets (yaxis and yaxis2 or None) """
+
+  # --- update artists   -----------------------------------------------------
+
+  @abc.abstractmethod
+  def update(self,frame,x_data):
+    """ update artists with the data of a new frame """
+
+  # --- create legends   -----------------------------------------------------
+
+  def legend(self,targets,options):
+    """ create legends for all targets """
+
+    for target,handles in zip(targets,self.handles):
+      if not target:
+        continue
+      if handles is None:
+        target.legend(**options)
+      else:
+        target.legend(handles=handles,**options)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMRendererCollection: render all values of an axis as a single
+# LineCollection
+#
+# The Agg-backend draws collections without path simplification, so the
+# values are decimated to the pixel-columns of the axis before the
+# segments are built: every pixel-column is reduced to its minimum and
+# maximum (like the path simplification of lines). Columns with missing
+# values (NaN) end with NaN, so gaps still interrupt the lines. The
+# segments are built at draw-time (so they match the current limits of
+# the axis), written into preallocated arrays and passed as views.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import numpy as np
+from matplotlib.collections import LineCollection
+
+from lib import DMRenderer
+
+# --- render values as line-collections   ------------------------------------
+
+class DMRendererCollection(DMRenderer):
+  """ render all values of an axis with a single artist """
+
+  # --- create segments for a line-collection   -----------------------------
+
+  def _segments(self,n,target,x,block):
+    """ fill segments (values x points x 2) of collection n, return view """
+
+    width = max(1,int(round(target.bbox.width)))
+    if block.shape[1] > 2*width:
+      (x,block) = self._decimate(x,block,target.get_xlim(),width)
+
+    # reuse the array of the collection (grows with the number of points)
+    size = block.shape[1]
+    if self._buffers[n].shape[1] < size:
+      self._buffers[n] = np.empty((block.shape[0],max(size,2*width),2))
+    segments = self._buffers[n][:,:size]
+    segments[:,:,0] = x
+    segments[:,:,1] = block
+    return segments
+
+  # --- decimate values   ----------------------------------------------------
+
+  def _decimate(self,x,block,limits,width):
+    """ reduce samples of every pixel-column to its minimum and maximum """
+
+    # samples left and right of the axis are collected in a single column
+    (xmin,xmax) = limits
+    px     = np.clip(np.floor((x-xmin)*(width/(xmax-xmin))),-1,width)
+    starts = np.flatnonzero(np.diff(px,prepend=np.nan))
+    ends   = np.append(starts[1:],len(px))-1
+
+    # minimum and maximum in the order of the trend within the column,
+    # columns with NaN end with NaN (np.add propagates NaN)
+    lo     = np.fmin.reduceat(block,starts,axis=1)
+    hi     = np.fmax.reduceat(block,starts,axis=1)
+    rising = block[:,starts] <= block[:,ends]
+    d_block = np.empty((block.shape[0],len(starts),2))
+    d_block[:,:,0] = np.where(rising,lo,hi)
+    d_block[:,:,1] = np.where(rising,hi,lo)
+    d_block[:,:,1][np.isnan(np.add.reduceat(block,starts,axis=1))] = np.nan
+
+    d_x = np.empty((len(starts),2))
+    d_x[:,0] = x[starts]
+    d_x[:,1] = x[ends]
+    return (d_x.reshape(-1),d_block.reshape(block.shape[0],-1))
+
+  # --- create artists   -----------------------------------------------------
+
+  def create(self,targets,frame,x_data):
+    """ create one line-collection per axis """
+
+    self._cols    = []
+    self._buffers = []
+    self._blocks  = []
+    self._x       = x_data
+    for i,target in enumerate(targets):
+      values = self._values(i)
+      if not target or not values:
+        continue
+      cols    = [v.col for v in values]
+      handles = self._proxies(values)
+      block   = frame.block(cols)
+      self._buffers.append(np.empty((len(cols),0,2)))
+      coll = LineCollection(self._segments(len(self.artists),target,
+                                           x_data,block),
+                            colors=[h.get_color() for h in handles],
+                            linewidths=[h.get_linewidth() for h in handles],
+                            linestyles=[h.get_linestyle() for h in handles])
+      target.add_collection(coll)
+      target.autoscale_view()
+      coll.draw = self._render(len(self.artists),target,coll)
+      self.handles[i] = handles
+      self.artists.append(coll)
+      self._cols.append(cols)
+      self._blocks.append(block)
+
+  # --- update artists   -----------------------------------------------------
+
+  def update(self,frame,x_data):
+    """ keep data of the frame, the segments are built at draw-time """
+
+    self._x = x_data
+    for n,cols in enumerate(self._cols):
+      self._blocks[n] = frame.block(cols)
+      self.artists[n].stale = True
+
+  # --- replace draw-method of a line-collection   ---------------------------
+
+  def _render(self,n,target,coll):
+    """ return draw-method which sets the segments and draws them """
+
+    draw = coll.draw
+    def render(renderer,*args,**kwargs):
+      coll.set_segments(self._segments(n,target,self._x,self._blocks[n]))
+      draw(renderer,*args,**kwargs)
+    return render
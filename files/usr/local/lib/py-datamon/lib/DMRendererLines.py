@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMRendererLines: render every value as a Line2D (default)
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+from lib import DMRenderer
+
+# --- render values as lines   -----------------------------------------------
+
+class DMRendererLines(DMRenderer):
+  """ render every value as a line """
+
+  # --- create artists   -----------------------------------------------------
+
+  def create(self,targets,frame,x_data):
+    """ create one line per value """
+
+    self._cols = []
+    for value in self._plot_cfg.values:
+      line = targets[value.axis-1].plot(x_data,
+                                        frame[value.col],
+                                        label = value.label,
+                                        **value.options)
+      self.artists.append(line[0])
+      self._cols.append(value.col)
+
+  # --- update artists   -----------------------------------------------------
+
+  def update(self,frame,x_data):
+    """ update data of all lines """
+
+    for line,col in zip(self.artists,self._cols):
+      line.set_data(x_data,frame[col])
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMRendererRaster: render all values of an axis into a single image
+#
+# The values are decimated to the pixel-columns of the axis: for every
+# pixel-column, a vertical span from the minimum to the maximum of the
+# samples (connected to the last sample of the previous column) is drawn
+# into an RGBA-buffer. The cost therefore depends on the size of the axis
+# and not on the number of samples. The buffer is rendered at draw-time in
+# the size of the axis and passed directly to the backend, so it always
+# matches the current limits and no resampling is necessary.
+#
+# Lines are thickened vertically according to their linewidth, markers and
+# linestyles are not supported. Missing values (NaN) interrupt the lines,
+# values without any valid sample are skipped.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import numpy as np
+from matplotlib.colors import to_rgba
+
+from lib import DMRenderer
+
+# --- render values into an image   ------------------------------------------
+
+class DMRendererRaster(DMRenderer):
+  """ render all values of an axis into an image """
+
+  # --- create artists   -----------------------------------------------------
+
+  def create(self,targets,frame,x_data):
+    """ create one image per axis """
+
+    self._cols   = []
+    self._colors = []
+    self._widths = []
+    self._x      = x_data
+    self._blocks = []
+    self._valid  = []
+    for i,target in enumerate(targets):
+      values = self._values(i)
+      if not target or not values:
+        continue
+      cols    = [v.col for v in values]
+      handles = self._proxies(values)
+      block   = frame.block(cols)
+      valid   = frame.valid(cols)
+
+      # let the axis scale to the data, the image then covers the axis
+      if valid.any() and not np.isnan(x_data).all():
+        target.update_datalim([(np.nanmin(x_data),np.nanmin(block)),
+                               (np.nanmax(x_data),np.nanmax(block))])
+        target.autoscale_view()
+      image = target.imshow(np.zeros((1,1,4),dtype=np.uint8),
+                            origin="lower",aspect="auto",
+                            interpolation="nearest",
+                            extent=target.get_xlim()+target.get_ylim())
+      image.draw = self._render(len(self.artists),target,image)
+
+      self.handles[i] = handles
+      self.artists.append(image)
+      self._cols.append(cols)
+      self._blocks.append(block)
+      self._valid.append(valid)
+      self._colors.append(np.array(
+        [to_rgba(h.get_color()) for h in handles])*255)
+      self._widths.append([h.get_linewidth() for h in handles])
+
+  # --- update artists   -----------------------------------------------------
+
+  def update(self,frame,x_data):
+    """ keep data of the frame, the images are rendered at draw-time """
+
+    self._x = x_data
+    for n,cols in enumerate(self._cols):
+      self._blocks[n] = frame.block(cols)
+      self._valid[n]  = frame.valid(cols)
+      self.artists[n].stale = True
+
+  # --- replace draw-method of an image   ------------------------------------
+
+  def _render(self,n,target,image):
+    """ return draw-method which renders the buffer and draws it """
+
+    def draw(renderer,*args,**kwargs):
+      if not image.get_visible():
+        return
+      bbox   = target.bbox
+      widths = [renderer.points_to_pixels(w) for w in self._widths[n]]
+      buffer = self._rasterize(self._x,self._blocks[n],self._valid[n],
+                               self._colors[n],widths,
+                               target.get_xlim()+target.get_ylim(),
+                               max(1,int(round(bbox.width))),
+                               max(1,int(round(bbox.height))))
+      gc = renderer.new_gc()
+      gc.set_clip_rectangle(bbox)
+      renderer.draw_image(gc,round(bbox.x0),round(bbox.y0),buffer)
+      gc.restore()
+      image.stale = False
+    return draw
+
+  # --- rasterize values   ---------------------------------------------------
+
+  def _rasterize(self,x,block,valid,colors,widths,limits,width,height):
+    """ draw decimated values into a RGBA-buffer (height x width) """
+
+    (xmin,xmax,ymin,ymax) = limits
+    buffer = np.zeros((height,width,4),dtype=np.uint8)
+
+    # pixel-columns of the visible samples (x is increasing)
+    px      = np.floor((x-xmin)*(width/(xmax-xmin)))
+    visible = np.flatnonzero((px >= 0) & (px < width))
+    if not len(visible):
+      return buffer
+    px     = px[visible].astype(int)
+    starts = np.flatnonzero(np.diff(px,prepend=-1))
+    cols   = px[starts]
+    ends   = np.append(starts[1:],len(px))-1
+    span   = np.arange(cols[0],cols[-1]+1)
+    rows   = np.arange(height)[:,None]
+    target = buffer[:,cols[0]:cols[-1]+1]
+
+    for color,lw,y,n_valid in zip(colors,widths,block,valid):
+      if not n_valid:
+        continue
+      y = (y[visible]-ymin)*(height/(ymax-ymin))
+
+      # columns without samples: interpolate the last values (a NaN as the
+      # last value of a column interrupts the line up to the next column)
+      mid = np.interp(span,cols,y[ends])
+      lo  = mid.copy()
+      hi  = mid.copy()
+      lo[cols-cols[0]] = np.fmin.reduceat(y,starts)
+      hi[cols-cols[0]] = np.fmax.reduceat(y,starts)
+
+      # connect to the previous column
+      lo[1:] = np.fmin(lo[1:],mid[:-1])
+      hi[1:] = np.fmax(hi[1:],mid[:-1])
+
+      # thicken line
+      lo -= (lw-1)/2
+      hi += (lw-1)/2
+      target[(rows >= np.floor(lo)) & (rows <= np.floor(hi))] = color
+    return buffer
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMStats: runtime statistics for live-plots
+#
+# The class collects counters, gauges and timing-histograms of the various
+# stages of the live-path (reading, parsing, updating, drawing). The
+# statistics are shown as an overlay of the figure and/or exported in the
+# Prometheus text-format to a file or to a local http-port.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import os, time, threading, bisect, collections
+
+# --- runtime statistics   ---------------------------------------------------
+
+class DMStats:
+  """ counters, gauges and histograms """
+
+  # --- constants   ----------------------------------------------------------
+
+  PREFIX   = "datamon_"
+  INTERVAL = 1                 # export interval for files (seconds)
+  BUCKETS  = (0.00001,0.0001,0.0005,0.001,0.0025,0.005,0.01,0.025,0.05,
+              0.1,0.25,0.5,1.0)
+
+  COUNTERS = {
+    "lines_read":    "lines read from the input",
+    "lines_dropped": "lines dropped (comments excluded)",
+    "samples":       "samples added to the data-store",
+    "frames":        "frames rendered",
+    "captures":      "windows captured in trigger-mode",
+    "gaps":          "gaps of the x-values (separated by NaN)",
+    "resets":        "resets of the x-values (new segments)",
+    "unordered":     "samples dropped because of decreasing x-values",
+    "invalid_x":     "samples dropped because of invalid (NaN) x-values",
+    "nan_values":    "invalid (NaN) values of new samples",
+    }
+  GAUGES = {
+    "buffer_depth":  "samples waiting in the buffer at the last update",
+    "fps":           "frames per second",
+    }
+  TIMERS = {
+    "parse":         "time to parse a single line",
+    "lock_wait":     "time waiting for the data-lock",
+    "update":        "time to copy the buffer to the data-store",
+    "update_plot":   "time to update the artists",
+    "draw":          "time to draw the artists",
+    }
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,app):
+    """ constructor """
+
+    self.msg       = app.msg
+    self.counters  = dict.fromkeys(self.COUNTERS,0)
+    self.gauges    = dict.fromkeys(self.GAUGES,0)
+    self._hist     = {name: [0]*(len(self.BUCKETS)+1) for name in self.TIMERS}
+    self._sum      = dict.fromkeys(self.TIMERS,0.0)
+    self._frames   = collections.deque(maxlen=50)
+
+  # --- increment counter   --------------------------------------------------
+
+  def count(self,name,n=1):
+    """ increment counter """
+
+    self.counters[name] += n
+
+  # --- set gauge   ----------------------------------------------------------
+
+  def set(self,name,value):
+    """ set value of gauge """
+
+    self.gauges[name] = value
+
+  # --- add observation to histogram   ---------------------------------------
+
+  def observe(self,name,secs):
+    """ add observation (in seconds) to histogram """
+
+    self._hist[name][bisect.bisect_left(self.BUCKETS,secs)] += 1
+    self._sum[name] += secs
+
+  # --- track frames   -------------------------------------------------------
+
+  def frame(self):
+    """ count frame and update fps """
+
+    now = time.perf_counter()
+    self._frames.append(now)
+    self.counters["frames"] += 1
+    if len(self._frames) > 1:
+      self.gauges["fps"] = (len(self._frames)-1)/(now-self._frames[0])
+
+  # --- mean of a histogram   ------------------------------------------------
+
+  def mean(self,name):
+    """ return mean of a histogram in seconds """
+
+    n = sum(self._hist[name])
+    return self._sum[name]/n if n else 0.0
+
+  # --- text for overlay   ---------------------------------------------------
+
+  def overlay(self):
+    """ return short summary for an overlay of the figure """
+
+    return ("fps: %.1f  read: %d  dropped: %d  buffer: %d  "
+            "parse: %.1fµs  lock: %.2fms  update: %.2fms  "
+            "plot: %.2fms  draw: %.2fms" % (
+              self.gauges["fps"],
+              self.counters["lines_read"],
+              self.counters["lines_dropped"],
+              self.gauges["buffer_depth"],
+              1000000*self.mean("parse"),
+              1000*self.mean("lock_wait"),
+              1000*self.mean("update"),
+              1000*self.mean("update_plot"),
+              1000*self.mean("draw")))
+
+  # --- export in prometheus text-format   -----------------------------------
+
+  def to_text(self):
+    """ return statistics in the Prometheus text-format """
+
+    lines = []
+    for name,help in self.COUNTERS.items():
+      metric = "%s%s_total" % (self.PREFIX,name)
+      lines.append("# HELP %s %s" % (metric,help))
+      lines.append("# TYPE %s counter" % metric)
+      lines.append("%s %d" % (metric,self.counters[name]))
+    for name,help in self.GAUGES.items():
+      metric = self.PREFIX + name
+      lines.append("# HELP %s %s" % (metric,help))
+      lines.append("# TYPE %s gauge" % metric)
+      lines.append("%s %g" % (metric,self.gauges[name]))
+    for name,help in self.TIMERS.items():
+      metric = "%s%s_seconds" % (self.PREFIX,name)
+      lines.append("# HELP %s %s" % (metric,help))
+      lines.append("# TYPE %s histogram" % metric)
+      total = 0
+      for le,n in zip(self.BUCKETS+("+Inf",),self._hist[name]):
+        total += n
+        lines.append('%s_bucket{le="%s"} %d' % (metric,le,total))
+      lines.append("%s_sum %g" % (metric,self._sum[name]))
+      lines.append("%s_count %d" % (metric,total))
+    lines.append("")
+    return "\n".join(lines)
+
+  # --- write statistics to file   -------------------------------------------
+
+  def _write_file(self,path,stop_event):
+    """ periodically write statistics to the given file """
+
+    tmp = path + ".tmp"
+    while not stop_event.wait(self.INTERVAL):
+      with open(tmp,"w") as f:
+        f.write(self.to_text())
+      os.replace(tmp,path)
+
+  # --- serve statistics via http   ------------------------------------------
+
+  def _serve(self,host,port):
+    """ serve statistics on a local http-port """
+
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    stats = self
+
+    class Handler(BaseHTTPRequestHandler):
+      def do_GET(self):
+        body = stats.to_text().encode()
+        self.send_response(200)
+        self.send_header("Content-Type","text/plain; version=0.0.4")
+        self.send_header("Content-Length",str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+      def log_message(self,*args):
+        pass
+
+    server = ThreadingHTTPServer((host,port),Handler)
+    server.daemon_threads = True
+    self.msg("DMStats: serving metrics on http://%s:%d/metrics" % (host,port))
+    server.serve_forever()
+
+  # --- start exporter   -----------------------------------------------------
+
+  def start_export(self,target,stop_event):
+    """ start export-thread: target is a file, a port or host:port """
+
+    host,_,port = target.rpartition(":")
+    if port.isdigit():
+      thread = threading.Thread(target=self._serve,
+                                args=(host or "localhost",int(port)),
+                                daemon=True)
+    else:
+      self.msg("DMStats: writing metrics to %s" % target)
+      thread = threading.Thread(target=self._write_file,
+                                args=(target,stop_event))
+    thread.start()
+    return thread
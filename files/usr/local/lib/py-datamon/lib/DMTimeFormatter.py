@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMTimeFormatter: tick-formatter for x-values of type time, date
+# and datetime
+#
+# x-values are floats: elapsed seconds for type "time" and unix-timestamps
+# for types "date" and "datetime". Ticks are formatted for all ticks at
+# once and the labels are cached, since during live-plotting the same
+# ticks are formatted over and over again.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import datetime
+import numpy as np
+from matplotlib.ticker import Formatter
+
+# --- tick-formatter   -------------------------------------------------------
+
+class DMTimeFormatter(Formatter):
+  """ format x-values as [hh:]mm:ss.mmm or as date/datetime """
+
+  MAX_CACHE = 1000
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,x_config):
+    """ constructor """
+
+    self._type   = x_config.type
+    self._format = x_config.format
+    self._cache  = {}
+
+  # --- format single tick   -------------------------------------------------
+
+  def __call__(self,x,pos=None):
+    """ format single tick """
+
+    try:
+      return self._cache[x]
+    except KeyError:
+      return self.format_ticks([x])[0]
+
+  # --- format all ticks   ---------------------------------------------------
+
+  def format_ticks(self,values):
+    """ format all ticks, only format values not in the cache """
+
+    if len(self._cache) > self.MAX_CACHE:
+      self._cache.clear()
+    missing = [v for v in values if v not in self._cache]
+    if missing:
+      if self._type in ["date","datetime"]:
+        labels = self._fmt_date(missing)
+      else:
+        labels = self._fmt_time(np.asarray(missing,dtype=float))
+      self._cache.update(zip(missing,labels))
+    return [self._cache[v] for v in values]
+
+  # --- format as date/datetime   --------------------------------------------
+
+  def _fmt_date(self,values):
+    """ format unix-timestamps (local time) """
+
+    return [datetime.datetime.fromtimestamp(v).strftime(self._format)
+                                                            for v in values]
+
+  # --- format as elapsed time   ---------------------------------------------
+
+  def _fmt_time(self,values):
+    """ format seconds as [hh:]mm:ss.mmm """
+
+    secs,frac = np.divmod(values,1)
+    m,s  = np.divmod(secs.astype(int),60)
+    h,m  = np.divmod(m,60)
+    frac = (1000*frac).astype(int)
+
+    labels = []
+    for h_,m_,s_,f_ in zip(h.tolist(),m.tolist(),s.tolist(),frac.tolist()):
+      f_ = "" if f_ == 0 else (".%03d" % f_).rstrip("0")
+      if h_ > 0:
+        labels.append("%02d:%02d:%02d%s" % (h_,m_,s_,f_))
+      else:
+        labels.append("%02d:%02d%s" % (m_,s_,f_))
+    return labels
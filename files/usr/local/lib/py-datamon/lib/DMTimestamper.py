@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Class DMTimestamper: timestamps for data without a real-time clock
+#
+# The wall-clock is only read once. All timestamps are derived from the
+# monotonic clock anchored to this wall-time, so they are cheap, never jump
+# (e.g. due to NTP) and have no jitter from clock-adjustments.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import time, datetime
+
+# --- timestamps from a monotonic clock   ------------------------------------
+
+class DMTimestamper:
+  """ create timestamps from a monotonic clock anchored to wall-time """
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self,ts_format="u"):
+    """ constructor: format i=iso, u=unix or a generic strftime-format """
+
+    self._format = ts_format
+    self._wall   = time.time()
+    self._mono   = time.monotonic()
+
+  # --- current time   -------------------------------------------------------
+
+  def now(self):
+    """ return current time as unix-timestamp """
+
+    return self._wall + (time.monotonic() - self._mono)
+
+  # --- format timestamp   ---------------------------------------------------
+
+  def format(self,ts):
+    """ format timestamp, strings are quoted """
+
+    if self._format == 'u':
+      return "%.6f" % ts
+    elif self._format == 'i':
+      return '"%s"' % datetime.datetime.fromtimestamp(ts).isoformat()
+    else:
+      return '"%s"' % datetime.datetime.fromtimestamp(ts).strftime(
+                                                                 self._format)
+
+  # --- check and timestamp line   -------------------------------------------
+
+  def stamp(self,line,sep,columns):
+    """ append timestamp to a line with the given columns, else return None """
+
+    if line.count(sep) != columns-1 or line.startswith(sep):
+      return None
+    return "%s%s%s" % (line,sep,self.format(self.now()))
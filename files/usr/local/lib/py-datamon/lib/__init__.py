@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 # ----------------------------------------------------------------------------
-# Application module for py-datamon. This file just imports all classes
+# Application module for py-datamon. This file imports all classes
 # into the namespace of the module.
 #
+# Configuration classes are cheap and imported directly. Classes which
+# depend on heavy packages (numpy, pandas, matplotlib) are imported lazily
+# on first access, so tools which only need the configuration start fast.
+#
 # Author: Bernhard Bablok
 # License: GPL3
 #
@@ -10,10 +14,51 @@
 #
 # ----------------------------------------------------------------------------
 
+import importlib, time
+
+from . DMConfigError   import DMConfigError   as DMConfigError
+from . DMConfigBase    import DMConfigBase    as DMConfigBase
 from . DMConfigX       import DMConfigX       as DMConfigX
 from . DMConfigAxis    import DMConfigAxis    as DMConfigAxis
 from . DMConfigValue   import DMConfigValue   as DMConfigValue
+from . DMConfigTrigger import DMConfigTrigger as DMConfigTrigger
 from . DMConfigSubplot import DMConfigSubplot as DMConfigSubplot
 from . DMConfigPlot    import DMConfigPlot    as DMConfigPlot
-from . DMPlot          import DMPlot          as DMPlot
-from . DMData          import DMData          as DMData
+from . DMFrame         import DMFrame         as DMFrame
+from . DMStats         import DMStats         as DMStats
+from . DMProfile       import DMProfile       as DMProfile
+from . DMTimestamper   import DMTimestamper   as DMTimestamper
+
+# classes imported on first access (name -> module)
+_LAZY = {
+  "DMPlot": ".DMPlot",
+  "DMData": ".DMData",
+  "DMTimeFormatter": ".DMTimeFormatter",
+  "DMPlan": ".DMPlan",
+  "DMDerived": ".DMDerived",
+  "DMIndex": ".DMIndex",
+  "DMRenderer": ".DMRenderer",
+  "DMRendererLines": ".DMRendererLines",
+  "DMRendererCollection": ".DMRendererCollection",
+  "DMRendererRaster": ".DMRendererRaster",
+  }
+
+# import time of lazy modules in seconds (name -> time)
+import_times = {}
+
+# --- import lazy classes   --------------------------------------------------
+
+def __getattr__(name):
+  """ import heavy classes on first access """
+
+  if name not in _LAZY:
+    raise AttributeError("module %r has no attribute %r" % (__name__,name))
+
+  start  = time.perf_counter()
+  module = importlib.import_module(_LAZY[name],__name__)
+  import_times[name] = time.perf_counter() - start
+
+  # replace the module-attribute (set by the import) with the class
+  cls = getattr(module,name)
+  globals()[name] = cls
+  return cls
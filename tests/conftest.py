@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Fixtures for the tests of py-datamon.
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import os, sys, types
+import pytest
+
+sys.path.insert(0,os.path.join(os.path.dirname(__file__),
+                               "..","files","usr","local","lib","py-datamon"))
+import lib
+
+os.environ.setdefault("MPLBACKEND","Agg")        # no windows during tests
+
+# --- application stub   -----------------------------------------------------
+
+@pytest.fixture
+def make_app():
+  """ return function creating an application stub with a configuration """
+
+  def _make_app(conf,is_live=True):
+    app = types.SimpleNamespace(msg=lambda text,force=False: None,
+                                debug=False,WAIT_INTERVAL=1,stats=None,
+                                output=None,freq=100,show_stats=False,
+                                profiler=None)
+    app.config = lib.DMConfigPlot(app,conf)
+    app.config.is_live = is_live
+    return app
+  return _make_app
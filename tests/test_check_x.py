@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Tests of the checks of x-values of live-data (DMData._check_x()).
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import numpy as np
+import lib
+
+# --- helper   ---------------------------------------------------------------
+
+def add(data,lines):
+  """ add lines and update the data """
+
+  for line in lines:
+    data._add_data(line)
+  data.update()
+  return data.snapshot()
+
+# --- tests   ----------------------------------------------------------------
+
+def test_reset_restarts_derived(make_app):
+  """ derived columns do not continue across a reset of the x-values """
+
+  conf = {"x": {"col": 0, "gap": 5}, "samples": 100,
+          "plots": [{"values": [{"col": 1},{"expr": "diff(c1)"}]}]}
+  app  = make_app(conf)
+  data = lib.DMData(app)
+  add(data,["%d,%d" % (x,100+x) for x in range(10)])
+  frame = add(data,["%d,%d" % (x,x) for x in range(3)])
+
+  col = app.config.plots[0].values[1].col
+  assert data.segment == 1
+  assert list(frame[0]) == [0,1,2]
+  assert np.isnan(frame[col][0]) and list(frame[col][1:]) == [1,1]
+
+def test_unordered_samples_skip_derived(make_app):
+  """ dropped samples are not part of derived columns """
+
+  conf = {"x": {"col": 0, "gap": 5}, "samples": 100,
+          "plots": [{"values": [{"col": 1},{"expr": "diff(c1)"}]}]}
+  app   = make_app(conf)
+  data  = lib.DMData(app)
+  frame = add(data,["0,0","1,1","2,2","1,50","3,3"])
+
+  col = app.config.plots[0].values[1].col
+  assert list(frame[0]) == [0,1,2,3]
+  assert list(frame[col][1:]) == [1,1,1]
+
+def test_last_x_without_limit(make_app):
+  """ the last x-value is kept while the gap-limit is still unknown """
+
+  conf = {"x": {"col": 0}, "samples": 100,
+          "plots": [{"values": [{"col": 1}]}]}
+  data = lib.DMData(make_app(conf))
+  add(data,["100,0"])
+  frame = add(data,["%d,%d" % (x,x) for x in range(5)])
+  assert data.segment == 1
+  assert list(frame[0]) == [0,1,2,3,4]
+
+def test_invalid_x_dropped(make_app):
+  """ samples with invalid x-values are dropped, invalid y-values kept """
+
+  conf = {"x": {"col": 0, "gap": 5}, "samples": 100,
+          "plots": [{"values": [{"col": 1}]}]}
+  data  = lib.DMData(make_app(conf))
+  frame = add(data,["0,0","1,1","x,2","3,y","4,4"])
+  assert list(frame[0]) == [0,1,3,4]
+  assert np.isnan(frame[1][2]) and frame.valid(1) == 3
+
+def test_normalize_after_invalid_x(make_app):
+  """ normalize uses the first valid x-value """
+
+  conf = {"x": {"col": 0, "normalize": True}, "samples": 100,
+          "plots": [{"values": [{"col": 1}]}]}
+  data = lib.DMData(make_app(conf))
+  add(data,["x,0"])
+  frame = add(data,["%d,%d" % (1000+x,x) for x in range(3)])
+  assert list(frame[0]) == [0,1,2]
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Tests of the validation of configurations (DMConfigPlot).
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import pytest
+import lib
+
+# --- tests   ----------------------------------------------------------------
+
+@pytest.mark.parametrize("conf",[
+  {"yaxis": {"max": "high"}},
+  {"plots": [{"values": [{"col": 1}],"yaxis2": {"min": True}}]},
+  {"xaxis": {"min": "5"}},
+  {"x": {"col": 0, "type": "date"}, "xaxis": {"min": "yesterday"}},
+  {"x": {"col": 0, "type": "datetime"}, "xaxis": {"max": 1700000000}},
+  ])
+def test_invalid_limits(make_app,conf):
+  """ limits must be numbers or date-strings for date/datetime x-values """
+
+  conf.setdefault("plots",[{"values": [{"col": 1}]}])
+  with pytest.raises(lib.DMConfigError):
+    make_app(conf)
+
+def test_valid_limits(make_app):
+  """ numeric limits and date-strings """
+
+  make_app({"x": {"col": 0, "type": "datetime"},
+            "xaxis": {"min": "2024-01-31T12:00:00"},
+            "yaxis": {"min": -1, "max": 2.5},
+            "plots": [{"values": [{"col": 1}]}]})
+
+# --- shared data   ----------------------------------------------------------
+
+def plot_conf(*values):
+  """ return configuration with a single subplot of the given values """
+
+  return {"plots": [{"values": list(values)}]}
+
+def test_merge_unscaled_and_scaled(make_app):
+  """ a column can't be scaled if another configuration plots it unscaled """
+
+  config = make_app(plot_conf({"col": 1})).config
+  for other in (plot_conf({"col": 1, "scale": 2}),
+                plot_conf({"col": 1, "scale": 3})):
+    with pytest.raises(lib.DMConfigError):
+      config.merge(make_app(other).config)
+  config.merge(make_app(plot_conf({"col": 1},{"col": 2,"scale": 2})).config)
+  assert config.col_scaled == {2: 2}
+
+def test_merge_keeps_unscaled_columns(make_app):
+  """ unscaled columns of merged configurations are checked as well """
+
+  config = make_app(plot_conf({"col": 2})).config
+  config.merge(make_app(plot_conf({"col": 1})).config)
+  with pytest.raises(lib.DMConfigError):
+    config.merge(make_app(plot_conf({"col": 1, "scale": 2})).config)
+
+def test_rebind_removed_scale(make_app):
+  """ a reload can't remove the scale of a column """
+
+  config = make_app(plot_conf({"col": 1, "scale": 2})).config
+  with pytest.raises(lib.DMConfigError):
+    config.rebind(make_app(plot_conf({"col": 1})).config)
+
+def test_scales_within_configuration(make_app):
+  """ subplots of a configuration use the same scale for a column """
+
+  with pytest.raises(lib.DMConfigError):
+    make_app({"plots": [{"values": [{"col": 1}]},
+                        {"values": [{"col": 1, "scale": 2}]}]})
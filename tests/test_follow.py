@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Tests of the follow-mode for growing csv-files (DMData.start_follow()).
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import threading, time
+import lib
+
+CONF = {"x": {"col": 0}, "samples": 100,
+        "plots": [{"values": [{"col": 1}]}]}
+
+# --- helper   ---------------------------------------------------------------
+
+def follow(data,file,lines,n_samples):
+  """ follow file, append lines and return a snapshot of the data """
+
+  stop_event = threading.Event()
+  thread     = data.start_follow(str(file),stop_event)
+  try:
+    with open(file,"a") as f:
+      f.writelines(lines)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+      time.sleep(data.FOLLOW_TICK)
+      data.update()
+      if len(data.snapshot()) >= n_samples:
+        break
+  finally:
+    stop_event.set()
+    thread.join()
+  return data.snapshot()
+
+# --- tests   ----------------------------------------------------------------
+
+def test_follow_header_only(make_app,tmp_path):
+  """ a file with only a header is followed from its end """
+
+  file = tmp_path / "data.csv"
+  file.write_text("# comment\nx,y\n")
+
+  frame = follow(lib.DMData(make_app(CONF)),file,
+                 ["%d,%d\n" % (i,2*i) for i in range(5)],5)
+  assert list(frame[0]) == [0,1,2,3,4]
+  assert list(frame[1]) == [0,2,4,6,8]
+
+def test_follow_loads_tail(make_app,tmp_path):
+  """ existing lines are loaded, appended lines are added """
+
+  file = tmp_path / "data.csv"
+  file.write_text("x,y\n" + "".join("%d,%d\n" % (i,i) for i in range(3)))
+
+  frame = follow(lib.DMData(make_app(CONF)),file,["3,3\n","4,4\n"],5)
+  assert list(frame[0]) == [0,1,2,3,4]
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Tests of live-plots (DMPlot).
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import time
+import numpy as np
+import lib
+
+# --- tests   ----------------------------------------------------------------
+
+def test_live_datetime_first_frame(make_app):
+  """ the first frame of a live date-plot waits for the first update """
+
+  conf = {"x": {"col": 0, "type": "datetime", "format": "%X"},
+          "samples": 100, "plots": [{"values": [{"col": 1, "label": "y"}]}]}
+  app  = make_app(conf)
+  data = lib.DMData(app)
+  now  = int(time.time())
+  for i in range(5):
+    data._add_data("%d,%d" % (now+i,i))
+
+  plotter = lib.DMPlot(app,app.config,data=data)
+  plotter.create()
+  plotter._fig.canvas.draw()               # starts the animation
+  assert not plotter._failed
+  frames = plotter._update_data()
+  assert not next(frames)
+  data.update()
+  assert next(frames)
+  plotter._update_plot(True)
+  assert not plotter._failed
+
+def test_collection_decimate():
+  """ decimation keeps minimum, maximum and gaps of every pixel-column """
+
+  x     = np.arange(1000,dtype=float)
+  block = np.vstack([np.sin(x/50),x])
+  block[0,500:510] = np.nan
+  renderer = lib.DMRendererCollection.__new__(lib.DMRendererCollection)
+  (d_x,d_block) = renderer._decimate(x,block,(0,1000),100)
+
+  assert len(d_x) == 200 and d_block.shape == (2,200)
+  assert np.nanmax(d_block[0]) == np.nanmax(block[0])
+  assert np.nanmin(d_block[0]) == np.nanmin(block[0])
+  assert np.isnan(d_block[0,101])          # column with the gap ends with NaN
+  assert not np.isnan(d_block[1]).any()
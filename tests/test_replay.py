@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Tests of the replay of csv-files (DMData.start_replay()).
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import numpy as np
+import lib
+
+CONF = {"x": {"col": 0, "scale": 0.001},
+        "plots": [{"values": [{"col": 1}]}]}
+
+# --- tests   ----------------------------------------------------------------
+
+def test_due_times_use_scaled_x(make_app,tmp_path):
+  """ x-values in ms with scale 0.001 are replayed in seconds """
+
+  file = tmp_path / "data.csv"
+  file.write_text("".join("%d,%d\n" % (1000+250*i,i) for i in range(5)))
+
+  data    = lib.DMData(make_app(CONF))
+  records = data._load_file(str(file))
+  due     = data._replay_due(records,speed=1,rate=0)
+  assert np.allclose(due,[0,0.25,0.5,0.75,1.0])
+  due     = data._replay_due(records,speed=2,rate=0)
+  assert np.allclose(due,[0,0.125,0.25,0.375,0.5])
+
+def test_due_times_with_rate(make_app,tmp_path):
+  """ rate ignores the x-values """
+
+  file = tmp_path / "data.csv"
+  file.write_text("".join("%d,%d\n" % (1000+250*i,i) for i in range(4)))
+
+  data    = lib.DMData(make_app(CONF))
+  records = data._load_file(str(file))
+  assert np.allclose(data._replay_due(records,speed=0,rate=2),
+                     [0,0.5,1.0,1.5])
+  assert data._replay_due(records,speed=0,rate=0) is None
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# Benchmark for the hot paths of py-datamon.
+#
+# The program drives the ingest (DMData._add_data()), the update
+# (DMData.update()) and the rendering (DMPlot._update_plot()) with a
+# synthetic data-stream and reports throughput, per-frame latencies and the
+# peak memory usage. Plotting uses the headless Agg-backend.
+#
+# Example:
+#
+#   tools/benchmark.py -r 10000 -C 13 -p 9 -w 2000 -n 200
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import locale, time, os, sys, math, resource, tempfile
+from   argparse import ArgumentParser
+from   pathlib  import Path
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+# --- application imports   --------------------------------------------------
+
+libdir = Path(sys.argv[0]).parent / "../files/usr/local/lib/py-datamon"
+sys.path.append(str(libdir))
+
+import lib
+from lib import DMConfigPlot
+
+# --- application class   ----------------------------------------------------
+
+class App:
+
+  # --- constants   ----------------------------------------------------------
+
+  WAIT_INTERVAL = 1
+  PERCENTILES   = [50,90,99,100]
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self):
+    """ constructor """
+
+    self.output     = None
+    self.stats      = None
+    self.show_stats = False
+    self.profiler   = None
+    parser = self._get_parser()
+    parser.parse_args(namespace=self)
+
+  # --- cmdline-parser   -----------------------------------------------------
+
+  def _get_parser(self):
+    """ configure cmdline-parser """
+
+    parser = ArgumentParser(add_help=False,
+                            description='Python Datamonitor Benchmark')
+
+    parser.add_argument('-r', '--rate', metavar='rate', type=int,
+      default=1000, help='simulated input rate in lines/s (default: 1000)')
+    parser.add_argument('-C', '--columns', metavar='columns', type=int,
+      default=7, help='number of data-columns incl. x (default: 7)')
+    parser.add_argument('-p', '--plots', metavar='plots', type=int,
+      default=1, help='number of subplots (default: 1)')
+    parser.add_argument('-w', '--width', metavar='samples', type=int,
+      default=500, help='number of samples in the live-window (default: 500)')
+    parser.add_argument('-n', '--frames', metavar='frames', type=int,
+      default=100, help='number of frames to render (default: 100)')
+    parser.add_argument('-f', '--freq', metavar='freq', type=float,
+      default=100, help='simulated frame interval in ms (default: 100)')
+    parser.add_argument('-s', '--static-rows', metavar='rows', type=int,
+      dest='static_rows', default=100000,
+      help='rows of the csv-file for import_file() (default: 100000)')
+    parser.add_argument('-c', '--config', metavar='conf', dest='conf_file',
+      help='use config-file instead of a synthetic config')
+    parser.add_argument('-R', '--render', choices=['lines','collection','raster'],
+      default='lines', help='renderer of the synthetic config (default: lines)')
+
+    parser.add_argument('-d', '--debug', action='store_true',
+      dest='debug', default=False,
+      help="force debug-mode")
+    parser.add_argument('-h', '--help', action='help',
+      help='print this help')
+
+    return parser
+
+  # --- print message   ------------------------------------------------------
+
+  def msg(self,text,force=False):
+    """ print message """
+
+    if force:
+      sys.stderr.write("%s\n" % text)
+    elif self.debug:
+      sys.stderr.write("[DEBUG %s] %s\n" % (time.strftime("%H:%M:%S"),text))
+    sys.stderr.flush()
+
+  # --- create configuration   -----------------------------------------------
+
+  def _create_config(self,conf_file):
+    """ create synthetic configuration (or read configuration-file) """
+
+    if conf_file:
+      import json
+      with open(conf_file,"r") as f:
+        return DMConfigPlot(self,json.load(f))
+
+    # distribute y-columns round-robin to the subplots
+    n_plots = max(1,min(self.plots,self.columns-1))
+    plots   = [{"values": []} for _ in range(n_plots)]
+    for col in range(1,self.columns):
+      plots[(col-1) % n_plots]["values"].append({"col": col})
+
+    return DMConfigPlot(self,{
+      "cols":    math.ceil(math.sqrt(n_plots)),
+      "samples": self.width,
+      "x":       {"col": 0, "type": "time"},
+      "xaxis":   {"text": "time (s)", "rescale": {"min": "+5", "max": "+10"}},
+      "legend":  {"loc": None},
+      "render":  self.render,
+      "plots":   plots
+      })
+
+  # --- create synthetic data   ----------------------------------------------
+
+  def _create_lines(self,n,t0=0):
+    """ create n csv-lines with self.columns columns """
+
+    t    = t0 + np.arange(n)/self.rate
+    cols = [t] + [np.sin(t*(c+1)) + np.random.normal(0,0.1,n)
+                                             for c in range(self.columns-1)]
+    return [",".join(map(repr,row)) for row in np.column_stack(cols).tolist()]
+
+  # --- report statistics   --------------------------------------------------
+
+  def _report(self,name,times,samples=None):
+    """ report latency-percentiles and throughput """
+
+    times = np.asarray(times)
+    pcts  = np.percentile(1000*times,self.PERCENTILES)
+    text  = " ".join(["p%d=%8.3f" % (p,v) for p,v in zip(self.PERCENTILES,pcts)])
+    rate  = ""
+    if samples:
+      rate = "%12.0f samples/s" % (samples/times.sum())
+    self.msg("%-12s %s ms %s" % (name,text,rate),force=True)
+
+  # --- benchmark live-path   ------------------------------------------------
+
+  def bench_live(self):
+    """ benchmark ingest, update and plot of live-data """
+
+    self.config = self._create_config(self.conf_file)
+    self.config.is_live = True
+    batch = max(1,int(self.rate*self.freq/1000))
+    self.msg("live: rate=%d lines/s, batch=%d lines/frame, frames=%d" %
+             (self.rate,batch,self.frames),force=True)
+
+    data  = lib.DMData(self)
+    lines = self._create_lines(batch*(self.frames+1))
+
+    # first batch: create data and figure
+    for line in lines[:batch]:
+      data._add_data(line)
+    plotter = lib.DMPlot(self,self.config,data=data)
+    fig = plotter._create_figure()
+    data.update()
+    fig.canvas.draw()
+
+    t_add    = []
+    t_update = []
+    t_plot   = []
+    t_render = []
+    for frame in range(1,self.frames+1):
+      chunk = lines[frame*batch:(frame+1)*batch]
+
+      start = time.perf_counter()
+      for line in chunk:
+        data._add_data(line)
+      t_add.append(time.perf_counter()-start)
+
+      start = time.perf_counter()
+      data.update()
+      t_update.append(time.perf_counter()-start)
+
+      start = time.perf_counter()
+      artists = plotter._update_plot(True)
+      t_plot.append(time.perf_counter()-start)
+
+      # this is what blitting does for every frame
+      start = time.perf_counter()
+      for artist in artists:
+        artist.axes.draw_artist(artist)
+      fig.canvas.blit(fig.bbox)
+      t_render.append(time.perf_counter()-start)
+
+    n = batch*self.frames
+    self._report("ingest",t_add,n)
+    self._report("update",t_update,n)
+    self._report("update_plot",t_plot,n)
+    self._report("render",t_render,n)
+    self._report("total",
+                 np.add.reduce([t_add,t_update,t_plot,t_render]),n)
+
+  # --- benchmark static-path   ----------------------------------------------
+
+  def bench_static(self):
+    """ benchmark import of a csv-file """
+
+    if not self.static_rows:
+      return
+    self.config = self._create_config(self.conf_file)
+    self.msg("static: rows=%d" % self.static_rows,force=True)
+    with tempfile.NamedTemporaryFile("w",suffix=".csv",delete=False) as f:
+      f.write("\n".join(self._create_lines(self.static_rows)))
+      f.write("\n")
+    try:
+      data  = lib.DMData(self)
+      start = time.perf_counter()
+      data.import_file(f.name)
+      self._report("import_file",[time.perf_counter()-start],self.static_rows)
+    finally:
+      os.unlink(f.name)
+
+  # --- report memory   ------------------------------------------------------
+
+  def report_memory(self):
+    """ report peak resident set size """
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+      rss = rss/1024                      # bytes on macOS, kB on Linux
+    self.msg("peak RSS: %.1f MB" % (rss/1024),force=True)
+
+# --- main program   ---------------------------------------------------------
+
+if __name__ == '__main__':
+
+  # set local to default from environment
+  locale.setlocale(locale.LC_ALL, '')
+
+  app = App()
+  app.bench_live()
+  app.bench_static()
+  app.report_memory()
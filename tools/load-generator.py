@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ----------------------------------------------------------------------------
+# A high-rate data-generator for stress-tests of the live-path.
+#
+# In contrast to tools/sincos-data.py, this generator creates the data in
+# batches, writes every batch with a single write and can sustain rates of
+# hundreds of kHz. The number of columns is configurable, an additional
+# datetime-column (as added by py-datareader.py) and malformed lines can
+# be generated. With option --binary, records are written as raw
+# little-endian float64 values.
+#
+# Example (50 kHz, 12 value-columns, 0.1% malformed lines):
+#
+#   tools/load-generator.py -r 50000 -c 12 -m 0.001 | py-datamon -c myconf.json -
+#
+# Author: Bernhard Bablok
+# License: GPL3
+#
+# Website: https://github.com/bablokb/py-datamon
+#
+# ----------------------------------------------------------------------------
+
+import locale, time, sys, datetime
+from   argparse import ArgumentParser
+
+import numpy as np
+
+from signal import signal, SIGPIPE, SIG_DFL
+signal(SIGPIPE,SIG_DFL)
+
+# --- application class   ----------------------------------------------------
+
+class App:
+
+  # --- constants   ----------------------------------------------------------
+
+  PERIOD    = 4096                # length of precomputed waveforms
+  MALFORMED = ["truncated","text","empty","long"]
+
+  # --- constructor   --------------------------------------------------------
+
+  def __init__(self):
+    """ constructor """
+
+    parser = self._get_parser()
+    parser.parse_args(namespace=self)
+
+    if not self.batch:
+      # about 100 writes per second
+      self.batch = max(1,int(self.rate/100)) if self.rate else 1000
+    self._rng = np.random.default_rng()
+    self._ts_cache = {}
+
+  # --- cmdline-parser   -----------------------------------------------------
+
+  def _get_parser(self):
+    """ configure cmdline-parser """
+
+    parser = ArgumentParser(add_help=False,
+                            description='Python Datamonitor Load-Generator')
+
+    parser.add_argument('-r', '--rate', metavar='rate', type=float,
+      default=1000,
+      help='lines per second, 0 for as fast as possible (default: 1000)')
+    parser.add_argument('-c', '--columns', metavar='columns', type=int,
+      default=6, help='number of value-columns (default: 6)')
+    parser.add_argument('-n', '--count', metavar='count', type=int,
+      default=0, help='number of lines, 0 for unlimited (default: 0)')
+    parser.add_argument('-b', '--batch', metavar='lines', type=int,
+      default=0, help='lines per write (default: rate/100)')
+    parser.add_argument('-u', '--unit', choices=['s','ms'], default='s',
+      help='unit of the x-column (default: s)')
+    parser.add_argument('-t', '--datetime', choices=['iso','unix'],
+      help='add a datetime-column (iso or unix)')
+    parser.add_argument('-m', '--malformed', metavar='fraction', type=float,
+      default=0, help='fraction of malformed lines (default: 0)')
+    parser.add_argument('-B', '--binary', action='store_true',
+      default=False, help='write float64-records instead of csv')
+    parser.add_argument('-h', '--help', action='help',
+      help='print this help')
+
+    return parser
+
+  # --- create waveforms   ---------------------------------------------------
+
+  def _create_tables(self):
+    """ precompute one period of every value-column """
+
+    t = 2*np.pi*np.arange(self.PERIOD)/self.PERIOD
+    self._values = np.empty((self.columns,self.PERIOD))
+    for c in range(self.columns):
+      self._values[c] = (np.sin((c % 4 + 1)*t + c) +
+                         self._rng.normal(0,0.05*(c % 3),self.PERIOD))
+
+    # formatting is expensive, so format every value only once
+    self._strings = [[repr(v) for v in col.tolist()] for col in self._values]
+
+  # --- format datetime-column   ---------------------------------------------
+
+  def _fmt_datetime(self,ts):
+    """ format timestamps as iso-strings (cached per second) """
+
+    result = []
+    for t in ts:
+      sec,frac = divmod(t,1)
+      prefix = self._ts_cache.get(sec)
+      if prefix is None:
+        if len(self._ts_cache) > 1000:
+          self._ts_cache.clear()
+        prefix = datetime.datetime.fromtimestamp(sec).isoformat()
+        self._ts_cache[sec] = prefix
+      result.append('"%s.%06d"' % (prefix,int(frac*1000000)))
+    return result
+
+  # --- create malformed line   ----------------------------------------------
+
+  def _malform(self,line,kind):
+    """ create a malformed version of the given line """
+
+    if kind == "truncated":
+      return line[:line.rfind(",")]
+    elif kind == "text":
+      words = line.split(",")
+      words[-1] = "ERR"
+      return ",".join(words)
+    elif kind == "empty":
+      return ""
+    else:
+      return line + ",0.0,0.0"
+
+  # --- create csv-batch   ---------------------------------------------------
+
+  def _csv_batch(self,index,x,ts):
+    """ create a batch of csv-lines """
+
+    idx  = (index % self.PERIOD).tolist()
+    cols = [[self._fmt % v for v in x.tolist()]]
+    cols.extend([[s[i] for i in idx] for s in self._strings])
+    if self.datetime == "iso":
+      cols.append(self._fmt_datetime(ts.tolist()))
+    elif self.datetime == "unix":
+      cols.append(["%.6f" % v for v in ts.tolist()])
+    lines = list(map(",".join,zip(*cols)))
+
+    if self.malformed:
+      bad = np.flatnonzero(self._rng.random(len(lines)) < self.malformed)
+      for i in bad.tolist():
+        lines[i] = self._malform(lines[i],self.MALFORMED[i % len(self.MALFORMED)])
+    lines.append("")
+    return "\n".join(lines).encode()
+
+  # --- create binary batch   ------------------------------------------------
+
+  def _binary_batch(self,index,x,ts):
+    """ create a batch of float64-records """
+
+    cols = [x,self._values[:,index % self.PERIOD]]
+    if self.datetime:
+      cols.append(ts)
+    block = np.vstack(cols).T
+    if self.malformed:
+      # there is no such thing as a malformed record, use NaN instead
+      bad = self._rng.random(block.shape[0]) < self.malformed
+      block[bad,1:] = np.nan
+    return block.astype('<f8').tobytes()
+
+  # --- run generator   ------------------------------------------------------
+
+  def run(self):
+    """ create data until count is reached """
+
+    self._fmt = "%d" if self.unit == "ms" else "%.6f"
+    x_fac = 1000 if self.unit == "ms" else 1
+    rate  = self.rate if self.rate else 1000     # virtual rate for the x-axis
+    batch = self._binary_batch if self.binary else self._csv_batch
+    out   = sys.stdout.buffer
+
+    self._create_tables()
+    t0   = time.perf_counter()
+    wall = time.time()
+    sent = 0
+    while not self.count or sent < self.count:
+      n = self.batch if not self.count else min(self.batch,self.count-sent)
+      index = np.arange(sent,sent+n)
+      x     = index/rate
+      out.write(batch(index,x*x_fac,wall+x))
+      out.flush()
+      sent += n
+
+      # wait for the deadline of the next batch
+      if self.rate:
+        delay = t0 + sent/self.rate - time.perf_counter()
+        if delay > 0:
+          time.sleep(delay)
+
+# --- main program   ---------------------------------------------------------
+
+if __name__ == '__main__':
+
+  # set local to default from environment
+  locale.setlocale(locale.LC_ALL, '')
+
+  try:
+    App().run()
+  except KeyboardInterrupt:
+    pass